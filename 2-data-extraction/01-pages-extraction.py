@@ -64,7 +64,9 @@ data.isnull().sum()
 # In[10]:
 
 
-data.to_csv('01-data.csv', index=False)
+from utils.datasetio import save_stage
+
+save_stage(data, '01-data')
 
 
 # # Step 1 Extracting Necessary Pages
@@ -74,9 +76,9 @@ data.to_csv('01-data.csv', index=False)
 # In[11]:
 
 
-from utils.firstpages import extract_first_three_pages , extract_first_two_pages_ocr
+from utils.firstpages import extract_first_three_pages , extract_first_two_pages_ocr, extract_pages_hybrid
 
-extract_first_two_pages_ocr(data['path'][20])
+extract_pages_hybrid(data['path'][20])
 
 
 # ## Extract pages
@@ -84,17 +86,20 @@ extract_first_two_pages_ocr(data['path'][20])
 # In[12]:
 
 
-batch_size = 100  
-num_batches = int(np.ceil(len(data) / batch_size))
+from utils.firstpages import make_ocr_pool
+from utils.jobrunner import run_page_extraction, load_page_results
+
+# Results go to step1-pages/ (manifest.sqlite + one parquet part per batch).
+# Re-running this cell skips every article the manifest already marks as done.
+# one worker per core, each Tesseract call single-threaded.
+# hybrid=True reads the PDF text layer first and only OCRs pages that fail the quality score
+with make_ocr_pool(workers=None, tesseract_threads=1) as pool:
+    manifest = run_page_extraction(data, "step1-pages", batch_size=100, hybrid=True, executor=pool)
+
+print(manifest["status"].value_counts())
 
-for batch_idx in range(num_batches):
-    start_idx = batch_idx * batch_size
-    end_idx = min((batch_idx + 1) * batch_size, len(data))
-    batch = data.iloc[start_idx:end_idx]
-    if 'path' in batch.columns:
-        pages = batch['path'].progress_apply(extract_first_two_pages_ocr).tolist()
-        data.loc[batch.index, ['page1', 'page2']] = pd.DataFrame(pages, index=batch.index)
-        data.to_csv(f"step1_progress_batch_{batch_idx}.csv", index=False)
+pages = load_page_results("step1-pages")
+data = data.drop(columns=["page1", "page2"], errors="ignore").merge(pages, on="article_id", how="left")
 
 if 'path' in data.columns:
     data = data.drop(columns=["path"])
@@ -103,7 +108,7 @@ if 'path' in data.columns:
 # In[14]:
 
 
-data.to_csv('02-extracted-pages.csv', index=False)
+save_stage(data, '02-extracted-pages')
 
 
 # In[ ]:
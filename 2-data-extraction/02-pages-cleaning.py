@@ -9,7 +9,7 @@
 import pandas as pd 
 import numpy as np
 import tqdm 
-from utils.qwen import infer, getTokenCount
+from utils.qwen import infer, count_tokens
 from utils.plots import boxplot_token_counts
 tqdm.tqdm.pandas()
 
@@ -17,8 +17,9 @@ tqdm.tqdm.pandas()
 # In[2]:
 
 
-df1=pd.read_csv("02-extracted-pages.csv")
-df2=pd.read_csv("01-data.csv")
+from utils.datasetio import load_stage, save_stage
+df1=load_stage("02-extracted-pages")
+df2=load_stage("01-data", columns=["path"])
 
 
 # ## now every article links to its path for verification later 
@@ -36,8 +37,9 @@ data.sample(1)
 # In[4]:
 
 
-data["page1_token_count"]=data["page1"].progress_apply(getTokenCount)
-data["page2_token_count"]=data["page2"].progress_apply(getTokenCount)
+# counted locally with the Qwen tokenizer (falls back to the server /tokenize endpoint)
+data["page1_token_count"]=count_tokens(data["page1"])
+data["page2_token_count"]=count_tokens(data["page2"])
 
 
 # In[5]:
@@ -74,7 +76,7 @@ print("page2 --------------: \n " + sample["page2"])
 
 
 #This function normalises text , removes ocr noise and removes non arabic text blocs
-from utils.preprocessing import clean_page
+from utils.preprocessing import clean_page, clean_pages
 
 
 # In[10]:
@@ -87,8 +89,9 @@ print("page2 --------------: \n " + clean_page(sample["page2"]))
 # In[11]:
 
 
-data["page1"] = data["page1"].progress_apply(clean_page)
-data["page2"] = data["page2"].progress_apply(clean_page)
+# same output as progress_apply(clean_page), compiled patterns + process pool
+data["page1"] = clean_pages(data["page1"])
+data["page2"] = clean_pages(data["page2"])
 
 
 # ### Recalculate and replot
@@ -96,8 +99,9 @@ data["page2"] = data["page2"].progress_apply(clean_page)
 # In[12]:
 
 
-data["page1_token_count"]=data["page1"].progress_apply(getTokenCount)
-data["page2_token_count"]=data["page2"].progress_apply(getTokenCount)
+# counted locally with the Qwen tokenizer (falls back to the server /tokenize endpoint)
+data["page1_token_count"]=count_tokens(data["page1"])
+data["page2_token_count"]=count_tokens(data["page2"])
 
 
 # In[13]:
@@ -179,5 +183,5 @@ data["keywords"] = None
 # In[21]:
 
 
-data.to_csv("03-pages_cleaned.csv",index=False)
+save_stage(data, "03-pages_cleaned")
 
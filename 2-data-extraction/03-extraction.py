@@ -12,6 +12,7 @@ get_ipython().run_line_magic('autoreload', '2')
 
 
 from utils.qwen import extract_article_metadata 
+from utils.datasetio import load_stage
 import pandas as pd
 import tqdm
 tqdm.tqdm.pandas()
@@ -20,7 +21,7 @@ tqdm.tqdm.pandas()
 # In[3]:
 
 
-data = pd.read_csv("03-pages_cleaned.csv")
+data = load_stage("03-pages_cleaned")
 
 
 # In[5]:
@@ -6,12 +6,13 @@
 
 import pandas as pd 
 import os
+from utils.datasetio import load_stage
 
 
 # In[2]:
 
 
-data=pd.read_csv("03-pages_cleaned.csv")
+data=load_stage("03-pages_cleaned")
 
 
 # In[4]:
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+get_ipython().run_line_magic('load_ext', 'autoreload')
+get_ipython().run_line_magic('autoreload', '2')
+import pandas as pd
+from utils.scheduler import run_metadata_extraction
+
+
+# In[ ]:
+
+
+# Configuration
+input_folder = "metadata-extraction-input"
+output_folder = "metadata-extraction-output"
+
+# One entry per llama.cpp server, "host:port/slots" (slots = the server's parallel slot count).
+# Rows are pulled from all chunks as a single queue by whichever server has a free slot.
+endpoints = [
+    "51.75.140.143:6000/1",
+    "51.75.140.143:6001/1",
+    "51.75.140.143:6002/1",
+]
+
+
+# In[ ]:
+
+
+stats = run_metadata_extraction(endpoints, input_folder, output_folder)
+stats
+
+
+# In[ ]:
+
+
+
+
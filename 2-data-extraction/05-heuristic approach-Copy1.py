@@ -23,7 +23,10 @@ tqdm.pandas()
 # In[4]:
 
 
-data = pd.read_csv("03-pages_cleaned.csv")
+from utils.datasetio import load_stage, save_stage
+
+# abstract_ar and keywords are recomputed below, so only the needed columns are loaded
+data = load_stage("03-pages_cleaned", columns=["article_id", "authors", "authors_en", "source", "path", "page1", "page2"])
 # Ensure text columns are strings
 data['page1'] = data['page1'].astype(str)
 data['page2'] = data['page2'].astype(str)
@@ -37,7 +40,7 @@ data['page2'] = data['page2'].astype(str)
 # In[5]:
 
 
-from utils.preprocessing import extract_abstract ,extract_keywords
+from utils.preprocessing import run_heuristics
 
 
 # ### Apply Extraction
@@ -45,11 +48,8 @@ from utils.preprocessing import extract_abstract ,extract_keywords
 # In[6]:
 
 
-# 1. Extract Abstract
-data['abstract_ar'] = data.progress_apply(extract_abstract, axis=1)
-
-# 2. Extract Keywords
-data['keywords'] = data.progress_apply(extract_keywords, axis=1)
+# Abstract and keywords in one pass over a process pool (prints the per-stage timings)
+data[['abstract_ar', 'keywords']] = run_heuristics(data)
 
 
 # In[7]:
@@ -110,7 +110,7 @@ data = data[columns_to_keep]
 # In[17]:
 
 
-data.to_csv("05-heuristic_extraction.csv", index=False)
+save_stage(data, "05-heuristic_extraction")
 
 
 # In[ ]:
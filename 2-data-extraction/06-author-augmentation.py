@@ -25,7 +25,6 @@ get_ipython().run_line_magic('autoreload', '2')
 import pandas as pd
 import re
 import numpy as np
-import ast
 from tqdm import tqdm
 
 tqdm.pandas()
@@ -35,20 +34,15 @@ tqdm.pandas()
 
 
 # Load Data
-data = pd.read_csv("05-heuristic_extraction.csv")
-
-# Ensure list columns are parsed correctly from strings
-def safe_eval(x):
-    try:
-        if pd.isna(x): return []
-        val = ast.literal_eval(x)
-        if isinstance(val, list): return val
-        return []
-    except:
-        return []
+from utils.datasetio import load_stage, save_stage
+data = load_stage("05-heuristic_extraction")
+
+# load_stage already returns the list columns as lists (None where nothing was extracted)
+def as_list(x):
+    return x if isinstance(x, list) else []
 
-data['authors_list_ar'] = data['authors'].apply(safe_eval)
-data['authors_list_en'] = data['authors_en'].apply(safe_eval)
+data['authors_list_ar'] = data['authors'].apply(as_list)
+data['authors_list_en'] = data['authors_en'].apply(as_list)
 
 
 # ## Name Normalization
@@ -225,14 +219,14 @@ final_data.columns
 
 
 # Save Authors Database
-authors_stats.to_csv("06-authors.csv", index=False)
+save_stage(authors_stats, "06-authors", also_csv=True)
 
 # Save Enriched Dataset
 # Retaining core columns and the new ID linkages
 final_cols = [c for c in data.columns if c not in ['authors', 'authors_en', 'authors_list_ar', 'authors_list_en']]
 final_data = data[final_cols]
 
-final_data.to_csv("06-data-extraction-final.csv", index=False)
+save_stage(final_data, "06-data-extraction-final", also_csv=True)
 
 print("Process Complete. Files saved.")
 
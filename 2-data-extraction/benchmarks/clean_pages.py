@@ -0,0 +1,58 @@
+"""
+Benchmark: utils.preprocessing.clean_page (row by row) vs clean_pages (batched).
+
+Run from 2-data-extraction/:
+    python -m benchmarks.clean_pages                      # the stage-1 backups shipped in Backupcsvs/Progress
+    python -m benchmarks.clean_pages 02-extracted-pages --repeat 4 --workers 4
+
+Fails if the two outputs differ anywhere.
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+
+from utils.datasetio import load_stage
+from utils.preprocessing import clean_page, clean_pages
+
+def load_pages(source: str) -> pd.Series:
+    if source.endswith(".csv") or "*" in source:
+        frames = [pd.read_csv(path, usecols=["page1", "page2"]) for path in sorted(glob.glob(source))]
+        data = pd.concat(frames, ignore_index=True)
+    else:
+        data = load_stage(source, columns=["page1", "page2"])
+    pages = pd.concat([data["page1"], data["page2"]], ignore_index=True)
+    return pages[pages.map(lambda p: isinstance(p, str))].reset_index(drop=True)
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f"{label:<32}{seconds:8.2f}s")
+    return result, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default="Backupcsvs/Progress/*.csv",
+                        help="stage artifact name or CSV glob with page1/page2 columns")
+    parser.add_argument("--repeat", type=int, default=1, help="replicate the pages to get a longer run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    pages = pd.concat([load_pages(args.source)] * args.repeat, ignore_index=True)
+    chars = pages.str.len().sum()
+    print(f"{len(pages)} pages, {chars / 1e6:.1f}M characters\n")
+
+    reference, base = timed("apply(clean_page)", lambda: pages.apply(clean_page))
+    for workers in sorted({1, args.workers}):
+        result, seconds = timed(f"clean_pages(workers={workers})", lambda: clean_pages(pages, workers=workers))
+        mismatches = int((result != reference).sum())
+        if mismatches:
+            raise SystemExit(f"clean_pages differs from clean_page on {mismatches} pages")
+        print(f"{'':<32}{base / seconds:7.1f}x, output identical")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: extract_abstract + extract_keywords (two row-wise apply passes) vs run_heuristics.
+
+Run from 2-data-extraction/:
+    python -m benchmarks.heuristics                       # the cleaned chunks shipped in metadata-extraction-input
+    python -m benchmarks.heuristics 03-pages_cleaned --repeat 8 --workers 4
+
+Fails if the outputs differ anywhere.
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+
+from utils.datasetio import load_stage
+from utils.preprocessing import extract_abstract, extract_keywords, run_heuristics
+
+def load_articles(source: str) -> pd.DataFrame:
+    if source.endswith(".csv") or "*" in source:
+        frames = [pd.read_csv(path, usecols=["page1", "page2"]) for path in sorted(glob.glob(source))]
+        data = pd.concat(frames, ignore_index=True)
+    else:
+        data = load_stage(source, columns=["page1", "page2"])
+    # as in 05-heuristic approach
+    return data.astype({"page1": str, "page2": str})
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f"{label:<32}{seconds:8.2f}s")
+    return result, seconds
+
+def count_mismatches(a: pd.Series, b: pd.Series) -> int:
+    """Number of differing values; missing values (None/NaN) compare equal."""
+    return sum(1 for x, y in zip(a, b) if not (x == y or (x is None or x != x) and (y is None or y != y)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default="metadata-extraction-input/chunk_*.csv",
+                        help="stage artifact name or CSV glob with page1/page2 columns")
+    parser.add_argument("--repeat", type=int, default=1, help="replicate the articles to get a longer run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    data = pd.concat([load_articles(args.source)] * args.repeat, ignore_index=True)
+    print(f"{len(data)} articles\n")
+
+    def reference():
+        return data.apply(extract_abstract, axis=1), data.apply(extract_keywords, axis=1)
+
+    (abstracts, keywords), base = timed("apply(extract_*) x2", reference)
+    for workers in sorted({1, args.workers}):
+        result, seconds = timed(f"run_heuristics(workers={workers})",
+                                lambda: run_heuristics(data, workers=workers, report=False))
+        mismatches = count_mismatches(result["abstract_ar"], abstracts) + count_mismatches(result["keywords"], keywords)
+        if mismatches:
+            raise SystemExit(f"run_heuristics differs from extract_abstract/extract_keywords on {mismatches} values")
+        print(f"{'':<32}{base / seconds:7.1f}x, output identical | {result.attrs['timings']}")
+
+if __name__ == "__main__":
+    main()
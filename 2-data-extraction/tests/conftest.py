@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the notebooks import `utils` from 2-data-extraction/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
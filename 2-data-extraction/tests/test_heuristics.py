@@ -0,0 +1,31 @@
+"""run_heuristics against the row-wise extract_abstract / extract_keywords applies of 05-heuristic approach."""
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from utils.preprocessing import extract_abstract, extract_keywords, run_heuristics
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def articles():
+    paths = sorted(glob.glob(os.path.join(HERE, "metadata-extraction-input", "chunk_*.csv")))
+    data = pd.concat([pd.read_csv(path, usecols=["page1", "page2"]) for path in paths], ignore_index=True)
+    return data.astype({"page1": str, "page2": str})
+
+def test_run_heuristics_matches_apply(articles):
+    expected = pd.DataFrame({
+        "abstract_ar": articles.apply(extract_abstract, axis=1),
+        "keywords": articles.apply(extract_keywords, axis=1),
+    }, dtype=object)
+    # apply leaves some missing values as NaN, run_heuristics always as None
+    expected = expected.where(expected.notna(), None)
+    extracted = run_heuristics(articles, report=False)
+    pd.testing.assert_frame_equal(extracted, expected)
+    assert extracted.attrs["timings"]["rows"] == len(articles)
+    # the process pool path, on a slice
+    pd.testing.assert_frame_equal(run_heuristics(articles.iloc[:300], workers=2, chunk_size=50, report=False),
+                                  expected.iloc[:300])
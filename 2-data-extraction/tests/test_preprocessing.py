@@ -0,0 +1,28 @@
+"""clean_pages against the row-wise clean_page it replaces in 02-pages-cleaning."""
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from utils.preprocessing import clean_page, clean_pages
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def pages():
+    paths = sorted(glob.glob(os.path.join(HERE, "Backupcsvs", "Progress", "*.csv")))
+    data = pd.concat([pd.read_csv(path, usecols=["page1", "page2"]) for path in paths], ignore_index=True)
+    return pd.concat([data["page1"], data["page2"]], ignore_index=True).rename("page")
+
+def test_clean_pages_matches_apply(pages):
+    expected = pages.apply(clean_page)
+    pd.testing.assert_series_equal(clean_pages(pages), expected)
+    # the process pool path, on a slice
+    sample = pages.iloc[:300]
+    pd.testing.assert_series_equal(clean_pages(sample, workers=2, chunk_size=50), expected.iloc[:300])
+
+def test_clean_pages_edge_values():
+    pages = pd.Series([None, float("nan"), 3, "", "ا-\nب  |  ___ ---\n12\n"], index=list("abcde"), name="page1")
+    pd.testing.assert_series_equal(clean_pages(pages), pages.apply(clean_page))
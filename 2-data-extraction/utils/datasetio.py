@@ -0,0 +1,112 @@
+"""Shared Parquet I/O for the pipeline artifacts (00-raw ... 06-data-extraction-final)."""
+
+import ast
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columns holding lists. In CSV they were stored as "['a', 'b']" / '["a", "b"]'
+# text; in Parquet they are real list columns (list<string> for names/keywords).
+LIST_COLUMNS = ("authors", "authors_en", "keywords", "author_ids", "articles_ids")
+
+# Low-cardinality columns, stored dictionary-encoded and loaded as pandas categoricals.
+CATEGORY_COLUMNS = ("source", "general_field")
+
+def parse_list(value) -> list:
+    """
+    Turns a CSV-serialized list back into a Python list, keeping the item types
+    the list was written with ("[1, 291]" gives ints, like the list<int64> Parquet
+    column). Accepts JSON ('["a"]'), Python repr ("['a']"), an actual list, or a
+    bare string (treated as a single item). Missing values stay None, so "not
+    extracted yet" remains distinguishable from an empty list.
+    """
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        for loader in (json.loads, ast.literal_eval):
+            try:
+                parsed = loader(text)
+                if isinstance(parsed, (list, tuple)):
+                    return list(parsed)
+            except (ValueError, SyntaxError):
+                pass
+        # last resort (malformed text): naive split into strings, like the old parse_string_to_list helpers
+        content = text.strip("[]")
+        return [item.strip().strip("'\"") for item in content.split(",") if item.strip().strip("'\"")]
+    return [text]
+
+def stage_path(name: str, ext: str) -> str:
+    """'03-pages_cleaned' -> '03-pages_cleaned.parquet' (an explicit extension is kept)."""
+    root, current = os.path.splitext(name)
+    if current in (".csv", ".parquet"):
+        name = root
+    return f"{name}.{ext}"
+
+def save_stage(df: pd.DataFrame, name: str, list_columns=LIST_COLUMNS,
+               category_columns=CATEGORY_COLUMNS, also_csv: bool = False) -> str:
+    """
+    Writes a pipeline artifact as Parquet.
+
+    Args:
+        df (pd.DataFrame): data to save.
+        name (str): artifact name, e.g. "03-pages_cleaned".
+        list_columns (tuple): columns stored as Parquet lists (only those present).
+        category_columns (tuple): columns dictionary-encoded (only those present).
+        also_csv (bool): also write the CSV, for consumers outside the pipeline.
+
+    Returns:
+        str: path of the Parquet file.
+    """
+    out = df.copy()
+    for col in list_columns:
+        if col in out.columns:
+            out[col] = out[col].map(parse_list)
+    for col in category_columns:
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    path = stage_path(name, "parquet")
+    pq.write_table(table, path, compression="zstd")
+    if also_csv:
+        df.to_csv(stage_path(name, "csv"), index=False)
+    return path
+
+def load_stage(name: str, columns=None, list_columns=LIST_COLUMNS) -> pd.DataFrame:
+    """
+    Loads a pipeline artifact, reading only `columns` if given.
+    Prefers the Parquet file and falls back to the legacy CSV, whose list
+    columns are parsed so both sources return the same shapes.
+
+    Args:
+        name (str): artifact name, e.g. "03-pages_cleaned".
+        columns (list): optional column projection.
+        list_columns (tuple): CSV columns parsed into Python lists (Parquet list
+            columns are detected from the schema).
+
+    Returns:
+        pd.DataFrame: the artifact.
+    """
+    parquet_path = stage_path(name, "parquet")
+    if os.path.exists(parquet_path):
+        table = pq.read_table(parquet_path, columns=columns)
+        df = table.to_pandas()
+        for field in table.schema:
+            if pa.types.is_list(field.type):
+                # pyarrow hands list cells back as numpy arrays; tolist() gives Python scalars, as the CSV path does
+                df[field.name] = df[field.name].map(lambda v: None if v is None else v.tolist())
+        return df
+
+    df = pd.read_csv(stage_path(name, "csv"), usecols=columns)
+    for col in list_columns:
+        if col in df.columns:
+            df[col] = df[col].map(parse_list)
+    return df
@@ -1,16 +1,210 @@
 import pytesseract
-from pdf2image import convert_from_path
+import pypdfium2 as pdfium
+import ctypes
 import json
+import multiprocessing
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from PyPDF2 import PdfReader
+import pymupdf
+from utils.ocrcache import resolve_cache
 
-def extract_first_three_pages(pdf_path):
+ARABIC_LETTER_RE = re.compile(r'[\u0621-\u064A]')
+LETTER_RE = re.compile(r'[^\W\d_]')
+# Arabic Presentation Forms-A/B: glyph codes leaked by PDFs with broken text layers
+PRESENTATION_FORM_RE = re.compile(r'[\uFB50-\uFDFF\uFE70-\uFEFF]')
+ARABIC_WORD_RE = re.compile(r'[\u0621-\u064A]{4,}')
+
+# Adaptive OCR: try the cheap resolutions first and stop as soon as the result
+# is confident enough. top_fraction=0.5 would OCR only the upper half of the page.
+ADAPTIVE_OCR_DEFAULTS = {
+    "dpis": (150, 300),
+    "min_confidence": 80.0,
+    "min_arabic_ratio": 0.3,
+    "top_fraction": None,
+}
+
+class _ReusableBitmapMaker:
+    """
+    pdfium bitmap factory that renders every page into the same ctypes buffer,
+    growing it only when a larger page comes along.
+    """
+
+    def __init__(self):
+        self.buffer = None
+
+    def __call__(self, width, height, format, rev_byteorder=False):
+        # 4 bytes per pixel covers every pdfium bitmap format
+        size = width * height * 4
+        if self.buffer is None or len(self.buffer) < size:
+            self.buffer = (ctypes.c_ubyte * size)()
+        return pdfium.PdfBitmap.new_native(width, height, format, rev_byteorder, buffer=self.buffer)
+
+def render_pages(pdf_path, page_numbers, dpi=300, top_fraction=None):
+    """
+    Streams grayscale renders of the requested pages (1-based), one at a time.
+    Only the requested pages are rasterized and they all share one buffer, so
+    memory stays bounded by a single page whatever the document length.
+
+    Args:
+        pdf_path (str): path to the PDF file.
+        page_numbers (iterable): 1-based page numbers; pages past the end are skipped.
+        dpi (int): rasterization resolution.
+        top_fraction (float): if set, only the top part of the page (e.g. 0.5 for
+            the upper half) is rendered.
+
+    Yields:
+        tuple: (page_number, PIL.Image). The image shares the render buffer and is
+        only valid until the next iteration; copy it if it must outlive the loop.
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    bitmap_maker = _ReusableBitmapMaker()
+    try:
+        for page_number in page_numbers:
+            if page_number > len(pdf):
+                continue
+            page = pdf[page_number - 1]
+            try:
+                crop = (0, 0, 0, 0)
+                if top_fraction:
+                    # crop is (left, bottom, right, top) in PDF points
+                    crop = (0, page.get_height() * (1 - top_fraction), 0, 0)
+                bitmap = page.render(scale=dpi / 72, crop=crop, grayscale=True, bitmap_maker=bitmap_maker)
+                yield page_number, bitmap.to_pil()
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+# Long-lived Tesseract handles, one per language string, owned by the current
+# process. Each pool worker therefore loads the traineddata once.
+_TESS_APIS = {}
+
+# tesserocr module, False when it is not installed, None until the first OCR call
+_TESSEROCR = None
+
+def _tesserocr():
+    """
+    The optional in-process Tesseract bindings (used instead of spawning the CLI),
+    or None. Imported on first use, not with this module: importing it loads
+    libtesseract's OpenMP runtime, which reads OMP_THREAD_LIMIT only at that moment.
+    """
+    global _TESSEROCR
+    if _TESSEROCR is None:
+        try:
+            import tesserocr
+            _TESSEROCR = tesserocr
+        except ImportError:
+            _TESSEROCR = False
+    return _TESSEROCR or None
+
+def _get_tess_api(lang):
+    api = _TESS_APIS.get(lang)
+    if api is None:
+        api = _tesserocr().PyTessBaseAPI(lang=lang)
+        _TESS_APIS[lang] = api
+    return api
+
+def _ocr_image(image, lang):
+    """
+    OCRs a PIL image. Uses a persistent tesserocr handle when tesserocr is
+    installed, otherwise falls back to pytesseract (one CLI process per call).
+    """
+    if _tesserocr() is not None:
+        api = _get_tess_api(lang)
+        api.SetImage(image)
+        return api.GetUTF8Text().strip()
+    return pytesseract.image_to_string(image, lang=lang).strip()
+
+def _ocr_image_with_confidence(image, lang):
+    """
+    OCRs an image with a single Tesseract call and returns (text, mean word confidence).
+    Without tesserocr the text is rebuilt from the pytesseract word boxes: words
+    joined by spaces, lines by newlines and blocks by blank lines.
+    """
+    if _tesserocr() is not None:
+        api = _get_tess_api(lang)
+        api.SetImage(image)
+        return api.GetUTF8Text().strip(), float(api.MeanTextConf())
+
+    data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+    blocks = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        line_key = (data["par_num"][i], data["line_num"][i])
+        blocks.setdefault(data["block_num"][i], {}).setdefault(line_key, []).append(word)
+        conf = float(data["conf"][i])
+        if conf >= 0:
+            confidences.append(conf)
+    text = "\n\n".join(
+        "\n".join(" ".join(words) for words in lines.values())
+        for lines in blocks.values()
+    )
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return text.strip(), confidence
+
+def _ocr_page_adaptive(pdf_path, page_number, lang, dpis, min_confidence, min_arabic_ratio, top_fraction):
+    """
+    OCRs a page at increasing resolutions, stopping at the first one whose mean
+    Tesseract confidence and Arabic-letter ratio pass the thresholds.
+    """
+    text = None
+    for dpi in dpis:
+        for _, image in render_pages(pdf_path, [page_number], dpi=dpi, top_fraction=top_fraction):
+            text, confidence = _ocr_image_with_confidence(image, lang)
+        if text is None:
+            return None
+        if confidence >= min_confidence and score_text_layer(text)["arabic_ratio"] >= min_arabic_ratio:
+            break
+    return text
+
+def _ocr_pdf_page(pdf_path, page_number, dpi=300, lang="ara+eng", cache=True, adaptive=False):
+    """
+    Rasterizes and OCRs a single page (1-based). Returns None if the page does not exist.
+    Results are looked up in / stored to the OCR cache (see utils.ocrcache).
+    `adaptive` (True or a dict overriding ADAPTIVE_OCR_DEFAULTS) replaces the fixed
+    `dpi` with the adaptive resolution ladder.
+    """
+    renderer = "pdfium-gray"
+    if adaptive:
+        options = {**ADAPTIVE_OCR_DEFAULTS, **(adaptive if isinstance(adaptive, dict) else {})}
+        options["dpis"] = tuple(options["dpis"])
+        dpi = options["dpis"][-1]
+        renderer += "/adaptive" + json.dumps(options, sort_keys=True)
+
+    cache = resolve_cache(cache)
+    if cache is not None:
+        key = cache.key(pdf_path, page_number, dpi, lang, renderer=renderer)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    text = None
+    if adaptive:
+        text = _ocr_page_adaptive(pdf_path, page_number, lang, **options)
+    else:
+        for _, image in render_pages(pdf_path, [page_number], dpi=dpi):
+            text = _ocr_image(image, lang)
+    if text is None:
+        return None
+
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+def extract_first_three_pages(pdf_path, cache=True, adaptive=False):
     """
     Extracts the first three pages of a PDF and returns a JSON object.
     Uses OCR only if no text is found via direct extraction.
 
     Args:
         pdf_path (str): path to the PDF file.
+        cache (bool | OCRCache): OCR result cache, True for the default one.
+        adaptive (bool | dict): adaptive-DPI OCR, see ADAPTIVE_OCR_DEFAULTS.
 
     Returns:
         dict: JSON object with the content of the first three pages.
@@ -25,37 +219,250 @@ def extract_first_three_pages(pdf_path):
                 extracted_text[f"page{i+1}"] = text.strip()
             else:
                 # Fallback to OCR for this page
-                pages = convert_from_path(pdf_path, dpi=300, first_page=i+1, last_page=i+1)
-                ocr_text = pytesseract.image_to_string(pages[0], lang="ara+eng")
-                extracted_text[f"page{i+1}"] = ocr_text.strip()
+                extracted_text[f"page{i+1}"] = _ocr_pdf_page(pdf_path, i+1, cache=cache, adaptive=adaptive)
     except Exception as e:
         # If direct extraction fails, fallback to OCR for all
-        pages = convert_from_path(pdf_path, dpi=300)
-        for i, page in enumerate(pages[:3], start=1):
-            page_text = pytesseract.image_to_string(page, lang="ara+eng")
-            extracted_text[f"page{i}"] = page_text.strip()
+        for i in range(1, 4):
+            page_text = _ocr_pdf_page(pdf_path, i, cache=cache, adaptive=adaptive)
+            if page_text is None:
+                break
+            extracted_text[f"page{i}"] = page_text
 
     return extracted_text
 
-def extract_first_two_pages_ocr(pdf_path):
+def extract_first_two_pages_ocr(pdf_path, cache=True, adaptive=False):
     """
     Extracts the first two pages of a PDF using OCR only.
     
     Args:
         pdf_path (str): path to the PDF file.
+        cache (bool | OCRCache): OCR result cache, True for the default one.
+        adaptive (bool | dict): adaptive-DPI OCR, see ADAPTIVE_OCR_DEFAULTS.
 
     Returns:
         dict: JSON object with the OCR content of the first two pages.
     """
     extracted_text = {}
     try:
-        pages = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=2)
-        for i, page in enumerate(pages, start=1):
-            ocr_text = pytesseract.image_to_string(page, lang="ara+eng")
-            extracted_text[f"page{i}"] = ocr_text.strip()
+        for i in range(1, 3):
+            ocr_text = _ocr_pdf_page(pdf_path, i, cache=cache, adaptive=adaptive)
+            if ocr_text is None:
+                break
+            extracted_text[f"page{i}"] = ocr_text
     except Exception as e:
         extracted_text["error"] = str(e)
     return extracted_text
+
+def score_text_layer(text):
+    """
+    Scores the Arabic quality of an embedded PDF text layer.
+
+    Args:
+        text (str): text extracted from the PDF text layer.
+
+    Returns:
+        dict: letters (count of letters), arabic_ratio (share of letters that are Arabic),
+        presentation_ratio (share of characters that are presentation-form glyphs),
+        reversed_ratio (share of long Arabic words that look written backwards,
+        i.e. ending with a reversed "ال" instead of starting with it).
+    """
+    if not isinstance(text, str):
+        text = ""
+    letters = len(LETTER_RE.findall(text))
+    arabic = len(ARABIC_LETTER_RE.findall(text))
+    presentation = len(PRESENTATION_FORM_RE.findall(text))
+
+    words = ARABIC_WORD_RE.findall(text)
+    forward = sum(1 for w in words if w.startswith("ال"))
+    backward = sum(1 for w in words if w.endswith("لا"))
+
+    return {
+        "letters": letters,
+        "arabic_ratio": arabic / letters if letters else 0.0,
+        "presentation_ratio": presentation / len(text) if text else 0.0,
+        "reversed_ratio": backward / (forward + backward) if (forward + backward) else 0.0,
+    }
+
+def is_usable_text_layer(text, min_letters=100, min_arabic_ratio=0.3,
+                         max_presentation_ratio=0.05, max_reversed_ratio=0.5):
+    """
+    Decides whether a text layer is good enough to skip OCR.
+
+    Args:
+        text (str): text extracted from the PDF text layer.
+        min_letters (int): pages with fewer letters are treated as scanned.
+        min_arabic_ratio (float): minimum share of Arabic letters.
+        max_presentation_ratio (float): maximum share of presentation-form glyphs.
+        max_reversed_ratio (float): maximum share of reversed Arabic words.
+
+    Returns:
+        bool: True if the text layer can be used as is.
+    """
+    score = score_text_layer(text)
+    return (
+        score["letters"] >= min_letters
+        and score["arabic_ratio"] >= min_arabic_ratio
+        and score["presentation_ratio"] <= max_presentation_ratio
+        and score["reversed_ratio"] <= max_reversed_ratio
+    )
+
+def _extract_page_hybrid(pdf_path, page_number, dpi=300, lang="ara+eng", quality=None, cache=True, adaptive=False):
+    """
+    Reads one page (1-based) from the text layer, falling back to OCR if the
+    text layer fails is_usable_text_layer. Returns None if the page does not exist.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        if page_number > doc.page_count:
+            return None
+        text = doc[page_number - 1].get_text("text").strip()
+    if is_usable_text_layer(text, **(quality or {})):
+        return text
+    return _ocr_pdf_page(pdf_path, page_number, dpi=dpi, lang=lang, cache=cache, adaptive=adaptive)
+
+def extract_pages_hybrid(pdf_path, n_pages=2, dpi=300, lang="ara+eng", quality=None, cache=True, adaptive=False):
+    """
+    Extracts the first pages of a PDF, reading the embedded text layer first and
+    running OCR only on the pages whose text layer fails the quality score.
+
+    Args:
+        pdf_path (str): path to the PDF file.
+        n_pages (int): number of leading pages to extract.
+        dpi (int): rasterization resolution for the OCR fallback.
+        lang (str): Tesseract language string for the OCR fallback.
+        quality (dict): optional keyword overrides for is_usable_text_layer.
+        cache (bool | OCRCache): OCR result cache, True for the default one.
+        adaptive (bool | dict): adaptive-DPI OCR fallback, see ADAPTIVE_OCR_DEFAULTS.
+
+    Returns:
+        dict: same shape as extract_first_two_pages_ocr ({"page1": ..., "page2": ...} or {"error": ...}).
+    """
+    extracted_text = {}
+    try:
+        for page_number in range(1, n_pages + 1):
+            text = _extract_page_hybrid(pdf_path, page_number, dpi=dpi, lang=lang, quality=quality,
+                                        cache=cache, adaptive=adaptive)
+            if text is not None:
+                extracted_text[f"page{page_number}"] = text
+    except Exception as e:
+        extracted_text = {"error": str(e)}
+    return extracted_text
+
+def _init_ocr_worker(tesseract_threads):
+    # Tesseract parallelises internally with OpenMP. With one process per core
+    # that oversubscribes the CPU, so each worker caps its own thread count.
+    # This runs in a freshly spawned interpreter, before tesserocr is imported
+    # (libgomp reads the variable once, when it loads); pytesseract's CLI
+    # processes inherit it from the worker's environment.
+    os.environ["OMP_THREAD_LIMIT"] = str(tesseract_threads)
+
+def _ocr_single_page(task):
+    """
+    Extracts one page of one PDF. Runs inside a pool worker.
+
+    Args:
+        task (tuple): (pdf_path, page_number, dpi, lang, hybrid, cache, adaptive), page_number is 1-based.
+
+    Returns:
+        tuple: (text or None, error message or None, seconds). text is None when
+        the page does not exist.
+    """
+    pdf_path, page_number, dpi, lang, hybrid, cache, adaptive = task
+    start = time.perf_counter()
+    try:
+        if hybrid:
+            text = _extract_page_hybrid(pdf_path, page_number, dpi=dpi, lang=lang,
+                                        cache=cache, adaptive=adaptive)
+        else:
+            text = _ocr_pdf_page(pdf_path, page_number, dpi=dpi, lang=lang, cache=cache, adaptive=adaptive)
+        return text, None, time.perf_counter() - start
+    except Exception as e:
+        return None, str(e), time.perf_counter() - start
+
+def make_ocr_pool(workers=None, tesseract_threads=1):
+    """
+    Creates a process pool for extract_pages_ocr_parallel.
+
+    The workers are spawned, not forked: a forked worker would inherit the
+    parent's OpenMP runtime if the parent already OCR'd a page with tesserocr
+    (e.g. extract_pages_hybrid before the pool), and that runtime ignores a
+    later OMP_THREAD_LIMIT.
+
+    Args:
+        workers (int): number of worker processes (defaults to all cores).
+        tesseract_threads (int): OpenMP threads each Tesseract call may use. Applies
+            to both backends: the tesserocr bindings loaded in the worker and the
+            tesseract CLI processes pytesseract starts.
+
+    Returns:
+        ProcessPoolExecutor: pool to pass as `executor` (use it as a context manager).
+    """
+    workers = workers or os.cpu_count() or 1
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_ocr_worker,
+        initargs=(tesseract_threads,),
+    )
+
+def extract_pages_ocr_parallel(pdf_paths, n_pages=2, workers=None, tesseract_threads=1,
+                               dpi=300, lang="ara+eng", hybrid=False, cache=True, adaptive=False,
+                               executor=None, return_timings=False):
+    """
+    OCRs the first pages of many PDFs on a process pool.
+    Every (pdf, page) pair is a separate task, so pages of the same document
+    are spread across cores too.
+
+    Args:
+        pdf_paths (list): paths to the PDF files.
+        n_pages (int): number of leading pages to OCR per PDF.
+        workers (int): number of worker processes (ignored if `executor` is given).
+        tesseract_threads (int): OpenMP threads per Tesseract call (ignored if `executor` is given).
+        dpi (int): rasterization resolution.
+        lang (str): Tesseract language string.
+        hybrid (bool): read the text layer first and OCR only the pages that fail
+            is_usable_text_layer (see extract_pages_hybrid).
+        cache (bool | OCRCache): OCR result cache, True for the default one.
+        adaptive (bool | dict): adaptive-DPI OCR, see ADAPTIVE_OCR_DEFAULTS.
+        executor (ProcessPoolExecutor): optional pool from make_ocr_pool, reused across calls.
+        return_timings (bool): also return the worker seconds spent on each PDF.
+
+    Returns:
+        list: one dict per PDF, in input order, shaped like extract_first_two_pages_ocr
+        ({"page1": ..., "page2": ...} or {"error": ...}).
+    """
+    pdf_paths = list(pdf_paths)
+    tasks = [(path, page_number, dpi, lang, hybrid, cache, adaptive)
+             for path in pdf_paths
+             for page_number in range(1, n_pages + 1)]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = make_ocr_pool(workers, tesseract_threads)
+    try:
+        # One page takes seconds to OCR, so per-task dispatch overhead is
+        # negligible and chunksize=1 gives the best load balancing.
+        page_results = list(executor.map(_ocr_single_page, tasks))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    results = []
+    timings = []
+    for doc_idx in range(len(pdf_paths)):
+        extracted_text = {}
+        doc_pages = page_results[doc_idx * n_pages:(doc_idx + 1) * n_pages]
+        for page_idx, (text, error, _) in enumerate(doc_pages):
+            if error is not None:
+                extracted_text = {"error": error}
+                break
+            if text is not None:
+                extracted_text[f"page{page_idx+1}"] = text
+        results.append(extracted_text)
+        timings.append(sum(seconds for _, _, seconds in doc_pages))
+    if return_timings:
+        return results, timings
+    return results
+
 if __name__ == "__main__":
     # Path to a sample PDF in the finalpdfs directory
     
@@ -0,0 +1,145 @@
+"""Resumable stage-1 page extraction: a SQLite manifest plus append-only Parquet parts."""
+
+import glob
+import os
+import sqlite3
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.firstpages import extract_pages_ocr_parallel
+from utils.ocrcache import file_sha256
+
+MANIFEST_FILE = "manifest.sqlite"
+PARTS_DIR = "parts"
+
+PAGES_SCHEMA = pa.schema([
+    ("article_id", pa.int64()),
+    ("page1", pa.string()),
+    ("page2", pa.string()),
+])
+
+def _open_manifest(out_dir: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(os.path.join(out_dir, MANIFEST_FILE))
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS manifest (
+            article_id INTEGER PRIMARY KEY,
+            pdf_sha256 TEXT,
+            status TEXT NOT NULL,
+            part TEXT,
+            seconds REAL,
+            finished_at REAL,
+            error TEXT
+        )"""
+    )
+    conn.commit()
+    return conn
+
+def load_manifest(out_dir: str) -> pd.DataFrame:
+    """Returns the manifest table (article_id, pdf_sha256, status, part, seconds, finished_at, error)."""
+    conn = _open_manifest(out_dir)
+    try:
+        return pd.read_sql_query("SELECT * FROM manifest ORDER BY article_id", conn)
+    finally:
+        conn.close()
+
+def _completed_ids(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT article_id FROM manifest WHERE status = 'done'")}
+
+def _safe_hash(path: str):
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+def run_page_extraction(data: pd.DataFrame, out_dir: str, batch_size: int = 100,
+                        retry_errors: bool = True, progress: bool = True, **extract_kwargs) -> pd.DataFrame:
+    """
+    Extracts page1/page2 for every row of `data` (needs `article_id` and `path`),
+    skipping articles the manifest already marks as done.
+
+    Each batch is written as its own Parquet part, then its manifest rows are
+    committed in one transaction, so a checkpoint costs O(batch) and a crash
+    loses at most the batch in flight.
+
+    Args:
+        data (pd.DataFrame): rows to process.
+        out_dir (str): directory holding the manifest and the Parquet parts.
+        batch_size (int): PDFs per checkpoint.
+        retry_errors (bool): re-run articles whose previous attempt failed.
+        progress (bool): print one line per batch.
+        **extract_kwargs: forwarded to extract_pages_ocr_parallel (hybrid, executor, workers, ...).
+
+    Returns:
+        pd.DataFrame: the manifest after the run.
+    """
+    os.makedirs(os.path.join(out_dir, PARTS_DIR), exist_ok=True)
+    conn = _open_manifest(out_dir)
+    try:
+        skip = _completed_ids(conn)
+        if not retry_errors:
+            skip |= {row[0] for row in conn.execute("SELECT article_id FROM manifest WHERE status = 'error'")}
+        todo = data[~data["article_id"].isin(skip)]
+        if progress:
+            print(f"{len(data) - len(todo)} articles already done, {len(todo)} to process")
+
+        for start in range(0, len(todo), batch_size):
+            batch = todo.iloc[start:start + batch_size]
+            batch_start = time.time()
+            pages, timings = extract_pages_ocr_parallel(batch["path"].tolist(), return_timings=True, **extract_kwargs)
+
+            part_name = f"part-{time.time_ns()}.parquet"
+            table = pa.Table.from_pydict({
+                "article_id": batch["article_id"].astype("int64").tolist(),
+                "page1": [p.get("page1") for p in pages],
+                "page2": [p.get("page2") for p in pages],
+            }, schema=PAGES_SCHEMA)
+            # write to a temp name and rename, so a crash never leaves a half-written part
+            part_path = os.path.join(out_dir, PARTS_DIR, part_name)
+            pq.write_table(table, part_path + ".tmp")
+            os.replace(part_path + ".tmp", part_path)
+
+            finished_at = time.time()
+            rows = [
+                (
+                    int(article_id),
+                    _safe_hash(path),
+                    "error" if "error" in result else "done",
+                    part_name,
+                    seconds,
+                    finished_at,
+                    result.get("error"),
+                )
+                for article_id, path, result, seconds in zip(batch["article_id"], batch["path"], pages, timings)
+            ]
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+            if progress:
+                errors = sum(1 for r in rows if r[2] == "error")
+                print(f"batch {start // batch_size + 1}: {len(batch)} articles in "
+                      f"{finished_at - batch_start:.1f}s ({errors} errors)")
+    finally:
+        conn.close()
+    return load_manifest(out_dir)
+
+def load_page_results(out_dir: str) -> pd.DataFrame:
+    """
+    Reads the extracted pages back as one DataFrame (article_id, page1, page2).
+    Only the part the manifest points to is kept for each article, so rows from
+    retried or interrupted batches are ignored.
+    """
+    manifest = load_manifest(out_dir)
+    parts = sorted(glob.glob(os.path.join(out_dir, PARTS_DIR, "*.parquet")))
+    if not parts:
+        return pd.DataFrame(columns=PAGES_SCHEMA.names)
+    frames = []
+    for part in parts:
+        frame = pq.read_table(part).to_pandas()
+        frame["part"] = os.path.basename(part)
+        frames.append(frame)
+    pages = pd.concat(frames, ignore_index=True)
+    pages = pages.merge(manifest[["article_id", "part"]], on=["article_id", "part"], how="inner")
+    return pages.drop(columns=["part"]).reset_index(drop=True)
@@ -0,0 +1,157 @@
+"""Async client for the llama.cpp server: pooled keep-alive connection, bounded concurrency, retries."""
+
+import asyncio
+import json
+import random
+
+import httpx
+
+from utils.qwen import API_HEADER, METADATA_KEYS, build_metadata_payload, parse_metadata_content, response_content
+
+# llama.cpp answers 503 while loading or when every slot is busy
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class AsyncLLMClient:
+    """
+    Sends chat completions to one llama.cpp server with at most `concurrency`
+    requests in flight. Set `concurrency` to the server's slot count
+    (LLAMA_ARG_PARALLEL), so continuous batching keeps every slot busy.
+
+    Usage:
+        async with AsyncLLMClient(host, port, concurrency=4) as client:
+            response = await client.chat(payload)
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6000, concurrency: int = 4,
+                 timeout: float = 600, connect_timeout: float = 10, retries: int = 3, backoff: float = 2.0):
+        self.base_url = f"http://{host}:{port}"
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self._client = None
+        self._slots = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(base_url=self.base_url, headers=API_HEADER,
+                                         timeout=self._timeout, limits=self._limits)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def post(self, path: str, payload: dict) -> dict:
+        """
+        POSTs `payload` to `path`, retrying connection errors, timeouts and
+        RETRY_STATUS answers with exponential backoff (plus jitter).
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._slots:
+                    response = await self._client.post(path, json=payload)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = httpx.HTTPStatusError(f"{response.status_code} from {self.base_url}{path}",
+                                              request=response.request, response=response)
+            except httpx.TransportError as e:
+                error = e
+            if attempt == self.retries:
+                raise RuntimeError(f"Inference failed after {attempt + 1} attempts ({self.base_url}): {error!r}")
+            # the slot is released while backing off, so other requests can use it
+            await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random() / 2))
+
+    async def chat(self, payload: dict) -> dict:
+        """Async counterpart of qwen.infer."""
+        return await self.post("/v1/chat/completions", payload)
+
+    async def extract_article_metadata(self, page1: str, page2: str, source: str = None,
+                                       keys=METADATA_KEYS) -> dict:
+        """
+        Async counterpart of qwen.extract_article_metadata, same return values:
+        {} for empty pages, None if the request or the JSON parsing failed.
+        """
+        payload = build_metadata_payload(page1, page2, source, keys=keys)
+        if payload is None:
+            return {}
+        content = None
+        try:
+            response_data = await self.chat(payload)
+            content = response_content(response_data)
+            return parse_metadata_content(content)
+        except json.JSONDecodeError:
+            print(f"Error: Model output was not valid JSON.\nRaw Output: {content}")
+            return None
+        except Exception as e:
+            print(f"Error during extraction: {e}")
+            return None
+
+async def _bounded_as_completed(items, worker, limit: int):
+    """
+    Runs worker(item) for every item with at most `limit` tasks alive and yields
+    (item, result) as they finish. Items are pulled lazily, so a long iterator is
+    never materialized.
+    """
+    items = iter(items)
+    pending = {}
+
+    def refill():
+        while len(pending) < limit:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending[asyncio.ensure_future(worker(item))] = item
+
+    refill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield pending.pop(task), task.result()
+            refill()
+    finally:
+        # the consumer stopped early: do not leave requests running
+        for task in pending:
+            task.cancel()
+
+async def extract_article_metadata_many(pages_iter, host: str = "localhost", port: int = 6000,
+                                        concurrency: int = 4, client: AsyncLLMClient = None, **client_kwargs):
+    """
+    Extracts metadata for many articles concurrently and yields results as they complete.
+
+    Args:
+        pages_iter: iterable of (key, page1, page2), (key, page1, page2, source) or
+            (key, page1, page2, source, keys); key is any id (row index, article_id), source
+            enables input packing (see packing.pack_pages), keys limits the fields asked for.
+        host (str), port (int): the llama.cpp server, when no client is given.
+        concurrency (int): requests in flight; match the server's slot count.
+        client (AsyncLLMClient): an open client to reuse instead.
+        **client_kwargs: forwarded to AsyncLLMClient (timeout, retries, backoff).
+
+    Yields:
+        (key, dict): the metadata in completion order (None on failure, {} for empty pages).
+
+    Usage (top-level await works in Jupyter):
+        async for key, metadata in extract_article_metadata_many(zip(df.index, df.page1, df.page2)):
+            ...
+    """
+    if client is None:
+        async with AsyncLLMClient(host, port, concurrency=concurrency, **client_kwargs) as own_client:
+            async for item in extract_article_metadata_many(pages_iter, client=own_client):
+                yield item
+        return
+
+    async def run(item):
+        return await client.extract_article_metadata(*item[1:])
+
+    # a few extra tasks queued behind the semaphore keep a slot from idling between requests
+    async for item, metadata in _bounded_as_completed(pages_iter, run, client.concurrency * 2):
+        yield item[0], metadata
@@ -0,0 +1,119 @@
+"""Persistent OCR result cache, keyed by PDF content hash, page, DPI, language and Tesseract version."""
+
+import hashlib
+import os
+import sqlite3
+from functools import lru_cache
+
+import pytesseract
+
+DEFAULT_CACHE_PATH = os.environ.get("OCR_CACHE_PATH", "ocr_cache.sqlite")
+
+@lru_cache(maxsize=4096)
+def _file_sha256(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_sha256(path: str) -> str:
+    """
+    SHA-256 of a file's content. Memoized on (path, size, mtime) so the pages
+    of one PDF only hash it once per process.
+    """
+    st = os.stat(path)
+    return _file_sha256(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> str:
+    """Installed Tesseract version, part of the cache key so upgrades invalidate old results."""
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except pytesseract.TesseractNotFoundError:
+        # tesserocr can run without the CLI; its banner reads "tesseract 5.3.0\n leptonica-..."
+        import tesserocr
+        return tesserocr.tesseract_version().split()[1]
+
+class OCRCache:
+    """
+    SQLite-backed OCR cache. Safe to share between pool workers: each process
+    opens its own connection lazily and the database runs in WAL mode.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._conn = None
+        self._pid = None
+
+    def __getstate__(self):
+        # connections cannot cross process boundaries; workers reopen their own
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS ocr_pages (
+                    pdf_sha256 TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    dpi INTEGER NOT NULL,
+                    lang TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (pdf_sha256, page, dpi, lang, engine)
+                )"""
+            )
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def key(self, pdf_path: str, page_number: int, dpi: int, lang: str, renderer: str = "") -> tuple:
+        """
+        Builds the cache key for one page (1-based) of a PDF. `renderer` tags the
+        rasterizer, since a different renderer can change the OCR output.
+        """
+        engine = tesseract_version() + (f"/{renderer}" if renderer else "")
+        return (file_sha256(pdf_path), page_number, dpi, lang, engine)
+
+    def get(self, key: tuple):
+        """Returns the cached text for `key`, or None on a miss."""
+        row = self._connection().execute(
+            "SELECT text FROM ocr_pages WHERE pdf_sha256=? AND page=? AND dpi=? AND lang=? AND engine=?",
+            key,
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: tuple, text: str) -> None:
+        """Stores the OCR text for `key`."""
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO ocr_pages (pdf_sha256, page, dpi, lang, engine, text) VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, text),
+        )
+        conn.commit()
+
+_default_cache = None
+
+def get_default_cache() -> OCRCache:
+    """Process-wide cache at OCR_CACHE_PATH (default: ./ocr_cache.sqlite)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = OCRCache(DEFAULT_CACHE_PATH)
+    return _default_cache
+
+def resolve_cache(cache):
+    """
+    Normalizes a `cache` argument: True -> default cache, False/None -> no cache,
+    an OCRCache instance is returned as is.
+    """
+    if cache is True:
+        return get_default_cache()
+    if not cache:
+        return None
+    return cache
@@ -0,0 +1,108 @@
+"""Token-budgeted LLM input: the pinpointed regions of an article instead of its two full pages."""
+
+from functools import lru_cache
+
+from utils.pinpoint import REGION_LABELS, pinpoint_regions
+
+# Prompt tokens allowed for the article text of one request
+PACK_BUDGET_TOKENS = 1500
+
+# Used only when the local tokenizer cannot be loaded (OCR'd Arabic runs ~3 chars per Qwen token)
+CHARS_PER_TOKEN_ESTIMATE = 3
+
+PAGE_BREAK = "\n--- PAGE BREAK ---\n"
+
+# Regions the model needs to answer each metadata key
+KEY_REGIONS = {
+    "title": ("TITLE_REGION",),
+    "abstract_ar": ("ABSTRACT_REGION",),
+    "general_field": ("TITLE_REGION", "ABSTRACT_REGION"),
+    "authors": ("AUTHORS_REGION",),
+    "keywords": ("KEYWORDS_REGION",),
+    "publish_date": ("TITLE_REGION",),
+}
+
+# Regions the model is asked to copy verbatim from (the prompt's abstract_ar), so never trimmed
+VERBATIM_REGIONS = {"abstract_ar": ("ABSTRACT_REGION",)}
+
+def regions_for_keys(keys) -> tuple:
+    """The REGION_LABELS needed for `keys`, in document order."""
+    needed = {label for key in keys for label in KEY_REGIONS[key]}
+    return tuple(label for label in REGION_LABELS if label in needed)
+
+def verbatim_regions_for_keys(keys) -> tuple:
+    """The REGION_LABELS that `keys` copy verbatim from, in document order."""
+    needed = {label for key in keys for label in VERBATIM_REGIONS.get(key, ())}
+    return tuple(label for label in REGION_LABELS if label in needed)
+
+@lru_cache(maxsize=1)
+def _token_counter():
+    from utils.qwen import load_tokenizer
+    try:
+        tokenizer = load_tokenizer()
+        return lambda text: len(tokenizer.encode(text).ids)
+    except Exception as e:
+        print(f"Local tokenizer unavailable ({e}); estimating tokens from characters")
+        return lambda text: len(text) // CHARS_PER_TOKEN_ESTIMATE
+
+def count_text_tokens(text: str) -> int:
+    return _token_counter()(text)
+
+def join_pages(page1: str, page2: str) -> str:
+    """The full-page input, as extract_article_metadata has always sent it."""
+    return PAGE_BREAK.join([page1 or "", page2 or ""])
+
+def _format_regions(regions: dict) -> str:
+    return "\n\n".join(f"{label}:\n{regions[label]}" for label in REGION_LABELS if regions.get(label))
+
+def _region_to_trim(lines: dict, verbatim) -> str:
+    """The region to drop a line from: the largest other one first, the abstract last, never a verbatim one."""
+    trimmable = [label for label in lines if len(lines[label]) > 1 and label not in verbatim]
+    others = [label for label in trimmable if label != "ABSTRACT_REGION"]
+    return max(others or trimmable, key=lambda label: sum(map(len, lines[label])), default=None)
+
+def pack_pages(page1: str, page2: str, source: str = None, budget_tokens: int = PACK_BUDGET_TOKENS,
+               labels=REGION_LABELS, verbatim=VERBATIM_REGIONS["abstract_ar"]) -> tuple:
+    """
+    Builds the smallest LLM input for an article.
+
+    The source's pinpointer slices the title/authors/abstract/keywords regions.
+    Only the regions in `labels` are kept, and if they exceed `budget_tokens`,
+    lines are dropped from the end of the largest of the other regions, then of
+    the abstract region, until they fit. The `verbatim` regions are never cut, so
+    the packed text can stay over budget. The full pages are used instead when
+    the source has no pinpointer, when its abstract anchor was not found, or when
+    they would be shorter than the regions anyway.
+
+    Args:
+        page1 (str), page2 (str): cleaned page texts.
+        source (str): journal code (AJP, AJSP, ajsrp, AM, ARPD).
+        budget_tokens (int): token cap for the packed regions (None: no cap).
+        labels (tuple): regions to keep, e.g. only those of the fields still missing.
+        verbatim (tuple): regions the model copies from (see verbatim_regions_for_keys).
+
+    Returns:
+        tuple: (text, mode), mode is "regions" or "full".
+    """
+    full_text = join_pages(page1, page2)
+    regions = pinpoint_regions(page1 or "", page2 or "", source) if source else None
+    if regions is None or not regions["ABSTRACT_REGION"]:
+        return full_text, "full"
+
+    lines = {label: regions[label].split("\n") for label in labels if regions.get(label)}
+    text = _format_regions({label: "\n".join(ls) for label, ls in lines.items()})
+    if budget_tokens is not None:
+        tokens = count_text_tokens(text)
+        while tokens > budget_tokens:
+            # stop when every region that may be trimmed is down to one line
+            label = _region_to_trim(lines, verbatim)
+            if label is None:
+                break
+            lines[label].pop()
+            text = _format_regions({label: "\n".join(ls) for label, ls in lines.items()})
+            tokens = count_text_tokens(text)
+
+    # none of the wanted regions was found: the model gets the pages
+    if not text or len(text) >= len(full_text):
+        return full_text, "full"
+    return text, "regions"
@@ -0,0 +1,66 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Callable
+
+
+# =========================
+# Core utilities (shared)
+# =========================
+
+def _normalize_unicode_and_strip_invisibles(text: str) -> str:
+    """NFKC normalize + remove invisible formatting chars (category Cf)."""
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Cf")
+    return text
+
+def _basic_cleanup(text: str) -> str:
+    """Light OCR cleanup that is safe for Arabic + English."""
+    if not isinstance(text, str):
+        return ""
+
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _normalize_unicode_and_strip_invisibles(text)
+
+    # Remove decorative punctuation/symbols
+    text = re.sub(r"[•●▪♦■★☆※…—–―‐-⁃⁄⁎⁑⁂⁕⁖⁗⁘⁙⁚⁛⁜⁝⁞]", " ", text)
+
+    # Normalize repeated punctuation
+    text = re.sub(r"\.{3,}", ".", text)
+    text = re.sub(r"[=]{2,}", " ", text)
+    text = re.sub(r"[_~^`]+", " ", text)
+
+    # Normalize whitespace
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+
+    return text.strip()
+
+def _join_pages(page1: str, page2: str) -> str:
+    p1 = _basic_cleanup(page1 or "")
+    p2 = _basic_cleanup(page2 or "")
+    if p1 and p2:
+        return p1 + "\n\n===== PAGE 2 =====\n\n" + p2
+    return p1 or p2
+
+
+
+# clean_page (utils.preprocessing) writes ة as ه and every alef form (أ إ آ ى) as ا,
+# so a header cue has to be matched in both its raw and its cleaned spelling
+_CLEANED_SPELLING = str.maketrans({"ة": "ه", "أ": "ا", "إ": "ا", "آ": "ا", "ى": "ا"})
+
+# Punctuation OCR leaves in front of a header line, e.g. "(الكلمات المفتاحيه: ..."
+_HEADER_LEAD_CHARS = "([{*-•:.؛، \t"
+
+def _with_cleaned_spellings(cues: List[str]) -> List[str]:
+    """`cues` plus their clean_page spelling, where it differs."""
+    out = list(cues)
+    for cue in cues:
+        cleaned = cue.translate(_CLEANED_SPELLING)
+        if cleaned not in out:
+            out.append(cleaned)
+    return out
+
+def _header_text(line: str) -> str:
+    """A lower-cased line without the punctuation that may precede its header word."""
+    return line.lower().lstrip(_HEADER_LEAD_CHARS)
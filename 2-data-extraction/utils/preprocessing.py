@@ -58,6 +58,98 @@ def clean_page(text: str) -> str:
 
 import re
 import pandas as pd
+
+# =============================================================================
+# BATCH CLEANING (same output as clean_page, for whole Series)
+# =============================================================================
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pyarabic.araby import TASHKEEL, TATWEEL, SMALL_ALEF, ALEF_MAKSURA, ALEF, TEH_MARBUTA, HEH, ALEFAT_PATTERN
+
+_HYPHEN_BREAK_RE = re.compile(r'(\w)-\s*\n\s*(\w)')
+_UNDERSCORE_RUN_RE = re.compile(r'_{3,}')
+_DASH_RUN_RE = re.compile(r'-{3,}')
+_NUMBER_LINE_RE = re.compile(r'^\s*\d+\s*$', flags=re.MULTILINE)
+_DISALLOWED_CHAR_RE = re.compile(r'[^\w\s\u0600-\u06FF\.,:;\-\(\)\[\]/@\+\*]')
+_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n')
+_ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+_NEWLINES_RE = re.compile(r'\n\s*\n*')
+
+# strip_tashkeel + strip_tatweel are plain deletions and normalize_alef + normalize_teh plain
+# one-char mappings, except that normalize_alef first folds SMALL_ALEF next to ALEF_MAKSURA.
+# A compiled class plus C-level str.replace beats both pyarabic and str.translate here:
+# translate falls back to a per-char dict lookup on non-ASCII text.
+_TASHKEEL_TATWEEL_RE = re.compile('[' + ''.join(TASHKEEL) + TATWEEL + ']')
+_ALEF_VARIANTS = [c for c in ALEFAT_PATTERN.pattern.strip('[]') if c != ALEF]
+
+def _normalize_arabic(text: str) -> str:
+    text = _TASHKEEL_TATWEEL_RE.sub('', text)
+    if SMALL_ALEF in text:
+        text = text.replace(SMALL_ALEF + ALEF_MAKSURA, ALEF_MAKSURA)
+        text = text.replace(ALEF_MAKSURA + SMALL_ALEF, ALEF_MAKSURA)
+    for variant in _ALEF_VARIANTS:
+        text = text.replace(variant, ALEF)
+    return text.replace(TEH_MARBUTA, HEH)
+
+def _clean_page_compiled(text) -> str:
+    """clean_page with precompiled patterns and a faster Arabic normalization."""
+    if not isinstance(text, str):
+        return ""
+
+    text = _normalize_arabic(text)
+    text = _HYPHEN_BREAK_RE.sub(r'\1\2', text)
+
+    text = text.replace('|', ' ')
+    text = _UNDERSCORE_RUN_RE.sub(' ', text)
+    text = _DASH_RUN_RE.sub(' ', text)
+    text = _NUMBER_LINE_RE.sub('', text)
+
+    # the filter has to stay here: the hyphenation and page-number patterns above see the unfiltered text
+    text = _DISALLOWED_CHAR_RE.sub(' ', text)
+
+    text = "\n\n".join(
+        block for block in _BLOCK_SPLIT_RE.split(text)
+        if _ARABIC_CHAR_RE.search(block) or len(block.strip()) < 50
+    )
+
+    text = _SPACE_RUN_RE.sub(' ', text.replace('\t', ' '))  # same as [ \t]+ -> ' '
+    text = _NEWLINES_RE.sub('\n', text)
+    return text.strip()
+
+# below this many rows the pool start-up and pickling cost more than the workers save
+_POOL_MIN_ROWS = 10_000
+
+def _clean_chunk(texts: list) -> list:
+    return [_clean_page_compiled(t) for t in texts]
+
+def clean_pages(pages: pd.Series, workers: int = None, chunk_size: int = 200) -> pd.Series:
+    """
+    Cleans a whole Series of pages; the output is identical to `pages.apply(clean_page)`.
+
+    Args:
+        pages (pd.Series): raw page texts (non-strings become "").
+        workers (int): worker processes; 1 runs in-process. None runs in-process below
+            _POOL_MIN_ROWS pages and uses os.cpu_count() workers above.
+        chunk_size (int): pages sent to a worker per task.
+
+    Returns:
+        pd.Series: cleaned pages, same index and name as `pages`.
+    """
+    texts = pages.tolist()
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if workers is None and len(texts) < _POOL_MIN_ROWS:
+        workers = 1
+    if workers == 1 or len(chunks) <= 1:
+        cleaned = _clean_chunk(texts)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            cleaned = [t for chunk in pool.map(_clean_chunk, chunks) for t in chunk]
+    return pd.Series(cleaned, index=pages.index, name=pages.name)
+
+
 arabic_pattern = re.compile(r'[\u0600-\u06FF]')
 #move non arabic strings to authors_en
 
@@ -90,17 +182,67 @@ def _generate_skeleton_pattern(word):
         elif char == 'ة':
             pattern += r"[هتة]" + noise_class
         else:
-            pattern += re.escape(char) + r"+?" + noise_class
+            # same as char+? ; spelled out so the compiled pattern starts with a literal,
+            # which lets the regex engine skip ahead to candidate positions
+            pattern += re.escape(char) * 2 + r"*?" + noise_class
     return pattern
 
+# =============================================================================
+# PATTERN BANK (built and compiled once, at import)
+# =============================================================================
+
+_ABS_ROOTS = ["ملخص", "مستخلص", "خلاصة", "موجز"]
+_KW_SECOND_ROOTS = ["مفتاحية", "دالة", "رئيسية"]
+_STOP_ROOTS = ["مقدمة", "تمهيد", "Introduction", "Correspondence", "المراجع"]
+_STOP_WORDS_SIMPLE = [r"Doi", r"1\.", r"\*", r"First", r"I\."]
+
+# Verbs opening an abstract that has no header (see extract_abstract, strategy 2).
+# Specific conjugated forms avoid matching random words like "Target" (noun)
+_FALLBACK_VERBS = [
+    "هدفت", "استهدفت", "تهدف", "يهدف", "هدف",   # H-D-F variations
+    "سعت", "تسعى", "يسعى",                       # S-A-Y (Strive) variations
+    "تناولت", "تتناول",                          # T-N-W-L (Deal with)
+    "ركزت", "تركز",                              # R-K-Z (Focus)
+    "تكمن",                                      # T-K-M-N (Reside/Lie in - common in 'problem statements')
+    "aims", "aimed", "objective", "purpose"      # English Fallbacks
+]
+
+# Abstract header
+_ABS_PATTERN = r"(?:" + "|".join([_generate_skeleton_pattern(w) for w in _ABS_ROOTS]) + r")"
+# Keyword header: "كلمات" + (مفتاحية|دالة|رئيسية) within 15 chars, or English
+_KW_START_PATTERN = (fr"(?:{_generate_skeleton_pattern('كلمات')}.{{0,15}}"
+                     fr"(?:{'|'.join([_generate_skeleton_pattern(w) for w in _KW_SECOND_ROOTS])})|Keywords|Key\s*words)")
+# Start of the next section
+_STOP_PATTERN = r"(?:" + "|".join([_generate_skeleton_pattern(w) for w in _STOP_ROOTS] + _STOP_WORDS_SIMPLE) + r")"
+_FALLBACK_PATTERN = r"(?:\b" + r"|\b".join([_generate_skeleton_pattern(w) for w in _FALLBACK_VERBS]) + r")"
+
+_ABS_RE = re.compile(_ABS_PATTERN)
+_KW_START_RE = re.compile(_KW_START_PATTERN)
+_FALLBACK_RE = re.compile(_FALLBACK_PATTERN)
+# End of an abstract: keyword header or next section
+_ABS_END_RE = re.compile(fr"({_KW_START_PATTERN}|{_STOP_PATTERN})")
+# End of a keyword line: next section or abstract header (or ")" when the header was in parentheses)
+_KW_LINE_END_RE = re.compile(_STOP_PATTERN + r"|" + _ABS_PATTERN)
+_KW_LINE_END_PAREN_RE = re.compile(_STOP_PATTERN + r"|" + _ABS_PATTERN + r"|\)")
+
+# Search-text folding, one character for another (str.replace is far cheaper than re.sub)
+_SEARCH_FOLDS = (('أ', 'ا'), ('إ', 'ا'), ('آ', 'ا'), ('ة', 'ه'), ('ى', 'ي'), ('ئ', 'ي'))
+_LEADING_PUNCT_RE = re.compile(r"^[:\-\.]+\s*")
+_ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+_KW_SEPARATOR_RE = re.compile(r'[،,;؛\|\•]')
+
 def _prepare_extraction_context(row):
     """
-    Prepares text (merging/normalization) and compiles regex patterns.
-    Returns a dictionary containing the context needed for extraction.
+    Prepares text (merging/normalization) for extraction.
+    Returns a dictionary containing the context needed for extraction
+    (the texts, plus the pattern-bank sources for callers that build on them).
     """
+    return _pages_context(row.get('page1', ''), row.get('page2', ''))
+
+def _pages_context(page1, page2):
     # 1. Text Merging
-    p1 = str(row.get('page1', '')).strip()
-    p2 = str(row.get('page2', '')).strip()
+    p1 = str(page1).strip()
+    p2 = str(page2).strip()
 
     if len(p1) > 20 and len(p2) > 20:
         header_chunk = p1[:40].split('\n')[0].strip()[:20]
@@ -114,33 +256,15 @@ def _prepare_extraction_context(row):
     
     # 2. Normalization for Search Index
     search_text = full_text.lower()
-    search_text = re.sub(r'[أإآا]', 'ا', search_text)
-    search_text = re.sub(r'[ةه]', 'ه', search_text)
-    search_text = re.sub(r'[يىئ]', 'ي', search_text)
-
-    # 3. Pattern Definitions
-    abs_roots = ["ملخص", "مستخلص", "خلاصة", "موجز"]
-    kw_roots  = ["كلمات", "مفتاحية", "دالة", "رئيسية"]
-    stop_roots = ["مقدمة", "تمهيد", "Introduction", "Correspondence", "المراجع"]
-
-    # Compile Abstract Regex
-    abs_regex = r"(?:" + "|".join([_generate_skeleton_pattern(w) for w in abs_roots]) + r")"
-    
-    # Compile Keyword Start Regex
-    kalimat_pat = _generate_skeleton_pattern("كلمات")
-    second_part_pat = r"(?:" + "|".join([_generate_skeleton_pattern(w) for w in ["مفتاحية", "دالة", "رئيسية"]]) + r")"
-    kw_start_pattern = fr"(?:{kalimat_pat}.{{0,15}}{second_part_pat}|Keywords|Key\s*words)"
-
-    # Compile Stop Pattern
-    stop_words_simple = [r"Doi", r"1\.", r"\*", r"First", r"I\."]
-    stop_pattern = r"(?:" + "|".join([_generate_skeleton_pattern(w) for w in stop_roots] + stop_words_simple) + r")"
+    for variant, base in _SEARCH_FOLDS:
+        search_text = search_text.replace(variant, base)
 
     return {
         "full_text": full_text,
         "search_text": search_text,
-        "abs_regex": abs_regex,
-        "kw_start_pattern": kw_start_pattern,
-        "stop_pattern": stop_pattern
+        "abs_regex": _ABS_PATTERN,
+        "kw_start_pattern": _KW_START_PATTERN,
+        "stop_pattern": _STOP_PATTERN
     }
 
 # =============================================================================
@@ -153,22 +277,23 @@ def extract_abstract(row):
     Includes a FALLBACK if no 'Abstract' header is found, searching for 
     start-of-abstract verbs (e.g., 'The study aimed', 'هدفت الدراسة').
     """
-    ctx = _prepare_extraction_context(row)
-    
+    return _extract_abstract(_prepare_extraction_context(row))
+
+def _extract_abstract(ctx):
     extracted_abstract = None
     candidates = []
 
     # =========================================================================
     # STRATEGY 1: Standard Header Search (Abstract, Mulakhas...)
     # =========================================================================
-    for match in re.finditer(ctx['abs_regex'], ctx['search_text']):
+    for match in _ABS_RE.finditer(ctx['search_text']):
         start_idx = match.end()
         
         # Define search window (look ahead ~3000 chars)
         window = ctx['search_text'][start_idx : start_idx + 3000]
         
         # Stop at Keyword Start OR Section Stop
-        stopper = re.search(fr"({ctx['kw_start_pattern']}|{ctx['stop_pattern']})", window)
+        stopper = _ABS_END_RE.search(window)
         
         if stopper:
             end_idx = start_idx + stopper.start()
@@ -176,16 +301,16 @@ def extract_abstract(row):
             end_idx = start_idx + min(len(window), 1000)
             
         candidate = ctx['full_text'][start_idx:end_idx].strip()
-        candidate = re.sub(r"^[:\-\.]+\s*", "", candidate) # Clean leading punctuation
+        candidate = _LEADING_PUNCT_RE.sub("", candidate) # Clean leading punctuation
         
         # Validation: Must contain Arabic and be of reasonable length
-        if len(candidate) > 50 and re.search(r'[\u0600-\u06FF]', candidate):
+        if len(candidate) > 50 and _ARABIC_CHAR_RE.search(candidate):
             candidates.append(candidate)
             
     if candidates:
         # If headers found, return the longest candidate
         extracted_abstract = max(candidates, key=len)
-        extracted_abstract = re.sub(r'\s+', ' ', extracted_abstract).strip()
+        extracted_abstract = " ".join(extracted_abstract.split())  # collapse whitespace runs, strip
         return extracted_abstract
 
     # =========================================================================
@@ -194,24 +319,11 @@ def extract_abstract(row):
     # If we are here, no "Mulakhas" or "Abstract" header was found.
     # We look for verbs like: هدفت، استهدفت، تهدف، سعت، يهدف
     
-    # 1. Define Verb Roots (H-D-F, S-A-Y, etc.)
-    # We use specific conjugated forms to avoid matching random words like "Target" (noun)
-    fallback_verbs = [
-        "هدفت", "استهدفت", "تهدف", "يهدف", "هدف",   # H-D-F variations
-        "سعت", "تسعى", "يسعى",                       # S-A-Y (Strive) variations
-        "تناولت", "تتناول",                          # T-N-W-L (Deal with)
-        "ركزت", "تركز",                              # R-K-Z (Focus)
-        "تكمن",                                      # T-K-M-N (Reside/Lie in - common in 'problem statements')
-        "aims", "aimed", "objective", "purpose"      # English Fallbacks
-    ]
-    
-    # Generate root-based patterns for these verbs
-    fallback_regex_list = [_generate_skeleton_pattern(w) for w in fallback_verbs]
-    fallback_pattern = r"(?:\b" + r"|\b".join(fallback_regex_list) + r")"
+    # (root-based patterns of _FALLBACK_VERBS, in the pattern bank)
     
     # Search for the FIRST occurrence of a purpose verb
     # We assume the abstract starts roughly here if no header exists.
-    fallback_match = re.search(fallback_pattern, ctx['search_text'])
+    fallback_match = _FALLBACK_RE.search(ctx['search_text'])
     
     if fallback_match:
         start_idx = fallback_match.start() # Start extracting FROM the verb
@@ -222,7 +334,7 @@ def extract_abstract(row):
         # Stop at Keyword Start OR Section Stop
         # Note: We must ensure we don't stop immediately if the "stop word" is part of the sentence
         # (unlikely for strict stops like "Introduction" or "Keywords")
-        stopper = re.search(fr"({ctx['kw_start_pattern']}|{ctx['stop_pattern']})", window)
+        stopper = _ABS_END_RE.search(window)
         
         if stopper:
             end_idx = start_idx + stopper.start()
@@ -236,7 +348,7 @@ def extract_abstract(row):
         # Also, valid abstracts usually mention "Study", "Research", "Paper" nearby.
         if start_idx < 3000 and len(candidate) > 50:
              extracted_abstract = candidate
-             extracted_abstract = re.sub(r'\s+', ' ', extracted_abstract).strip()
+             extracted_abstract = " ".join(extracted_abstract.split())
 
     return extracted_abstract
 
@@ -248,12 +360,13 @@ def extract_keywords(row):
     """
     Extracts Keywords using strict line constraints.
     """
-    ctx = _prepare_extraction_context(row)
-    
+    return _extract_keywords(_prepare_extraction_context(row))
+
+def _extract_keywords(ctx):
     extracted_keywords = None
     kw_candidates = []
     
-    for match in re.finditer(ctx['kw_start_pattern'], ctx['search_text']):
+    for match in _KW_START_RE.finditer(ctx['search_text']):
         start_idx = match.end()
         
         # 1. Determine the "Active Line"
@@ -276,12 +389,10 @@ def extract_keywords(row):
         # 3. Check for Stop Marker within the line
         pre_char = ctx['search_text'][match.start()-1] if match.start() > 0 else ""
         
-        # Construct stop pattern specifically for this line check
-        current_stop_pat = ctx['stop_pattern'] + r"|" + ctx['abs_regex']
-        if pre_char == '(':
-            current_stop_pat += r"|\)"
+        # Stop pattern specifically for this line check
+        line_end_re = _KW_LINE_END_PAREN_RE if pre_char == '(' else _KW_LINE_END_RE
 
-        stopper = re.search(current_stop_pat, line_content)
+        stopper = line_end_re.search(line_content)
         
         if stopper:
             final_end_idx = start_idx + stopper.start()
@@ -290,7 +401,7 @@ def extract_keywords(row):
             
         # Extract from full_text
         raw_kw = ctx['full_text'][start_idx:final_end_idx].strip()
-        raw_kw = re.sub(r"^[:\-\.]+\s*", "", raw_kw)
+        raw_kw = _LEADING_PUNCT_RE.sub("", raw_kw)
         
         if len(raw_kw) > 3:
             kw_candidates.append(raw_kw)
@@ -300,7 +411,7 @@ def extract_keywords(row):
         best_raw_kw = kw_candidates[-1] 
         
         # Splitting Logic
-        tokens = re.split(r'[،,;؛\|\•]', best_raw_kw)
+        tokens = _KW_SEPARATOR_RE.split(best_raw_kw)
         clean_list = []
         for t in tokens:
             t = t.strip().strip('.-:()[]')
@@ -316,104 +427,291 @@ def extract_keywords(row):
             extracted_keywords = clean_list
 
     return extracted_keywords
+
+def extract_abstract_and_keywords(row):
+    """
+    extract_abstract and extract_keywords in one call: the pages are merged and
+    normalized once for both.
+
+    Returns:
+        tuple: (abstract, keywords), the same values as the two functions.
+    """
+    ctx = _prepare_extraction_context(row)
+    return _extract_abstract(ctx), _extract_keywords(ctx)
+
+# =============================================================================
+# BATCH EXTRACTION (same output as the row functions, for whole DataFrames)
+# =============================================================================
+
+HEURISTIC_STAGES = ("prepare", "abstract", "keywords")
+
+def _extract_chunk(pages: list) -> tuple:
+    """
+    Abstract and keywords for a list of (page1, page2) tuples.
+    Returns (results, seconds), seconds being the CPU time spent per HEURISTIC_STAGES.
+    """
+    clock = time.perf_counter
+    seconds = dict.fromkeys(HEURISTIC_STAGES, 0.0)
+    results = []
+    for page1, page2 in pages:
+        t0 = clock()
+        ctx = _pages_context(page1, page2)
+        t1 = clock()
+        abstract = _extract_abstract(ctx)
+        t2 = clock()
+        keywords = _extract_keywords(ctx)
+        t3 = clock()
+        seconds["prepare"] += t1 - t0
+        seconds["abstract"] += t2 - t1
+        seconds["keywords"] += t3 - t2
+        results.append((abstract, keywords))
+    return results, seconds
+
+def run_heuristics(df: pd.DataFrame, workers: int = None, chunk_size: int = 200,
+                   report: bool = True) -> pd.DataFrame:
+    """
+    Heuristic abstract and keyword extraction over a whole DataFrame; the values are
+    identical to `df.apply(extract_abstract, axis=1)` / `df.apply(extract_keywords, axis=1)`.
+    Only (page1, page2) tuples are sent to the worker processes, `chunk_size` rows per task.
+
+    Args:
+        df (pd.DataFrame): articles with page1 and page2 columns.
+        workers (int): worker processes; 1 runs in-process. None runs in-process below
+            _POOL_MIN_ROWS rows and uses os.cpu_count() workers above.
+        chunk_size (int): rows sent to a worker per task.
+        report (bool): print the timing report.
+
+    Returns:
+        pd.DataFrame: "abstract_ar" and "keywords" columns (None where nothing was
+            found), same index as `df`. The timing report is kept in `.attrs["timings"]`:
+            wall seconds, rows/s, and the CPU seconds of each stage summed over workers.
+    """
+    start = time.perf_counter()
+    pages = list(zip(df["page1"].tolist(), df["page2"].tolist()))
+    chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+    if workers is None and len(pages) < _POOL_MIN_ROWS:
+        workers = 1
+    if workers == 1 or len(chunks) <= 1:
+        workers = 1
+        outputs = [_extract_chunk(pages)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_extract_chunk, chunks))
+
+    results = [r for chunk_results, _ in outputs for r in chunk_results]
+    extracted = pd.DataFrame(results, columns=["abstract_ar", "keywords"], index=df.index, dtype=object)
+
+    wall = time.perf_counter() - start
+    timings = {"rows": len(df), "workers": workers or os.cpu_count(), "wall_s": round(wall, 3),
+               "rows_per_s": round(len(df) / wall, 1) if wall else None}
+    for stage in HEURISTIC_STAGES:
+        timings[f"{stage}_cpu_s"] = round(sum(seconds[stage] for _, seconds in outputs), 3)
+    extracted.attrs["timings"] = timings
+    if report:
+        print(" | ".join(f"{key}: {value}" for key, value in timings.items()))
+    return extracted
 import re
 import pandas as pd
 
 import re
 import pandas as pd
 
-def validate_author_name(name_candidate):
-    """
-    Validates if a string is a human name using negative lookups.
-    Updated based on specific failure cases (Edaad, Locations, Degrees).
-    """
-    if not name_candidate or not isinstance(name_candidate, str):
-        return False, ""
+# --- Name validation, compiled once (validate_author_name runs per candidate line and per split token) ---
 
-    name = name_candidate.strip()
+# Leading/trailing punctuation and OCR artifacts, e.g. ". د/" or ".." or "OO a"
+_NAME_EDGE_START_RE = re.compile(r'^[\.\-/_:,\s\*]+')
+_NAME_EDGE_END_RE = re.compile(r'[\.\-/_:,\s\*]+$')
+# Academic Titles (English & Arabic)
+# Handle variations: Dr., Dr/, d., د., د/, أ.د, ا.د (Bare Alef)
+_NAME_TITLES_RE = re.compile(r'^\s*(?:Co-Prof|Prof|Dr|Mr|Mrs|Ms|Eng|Assoc|Lecturer|Researcher|Student|Candidate|د\.|أ\.د|ا\.د|بروف|م\.|الذكتور|الاستاذ|الدكتور|الباحث|الطالب|المعلم|د\/|أ\/)\.?\s*', re.IGNORECASE)
 
-    # --- 1. PRE-CLEANING (Aggressive) ---
-    # Remove leading/trailing punctuation and OCR artifacts
-    # e.g. ". د/" or ".." or "OO a"
-    name = re.sub(r'^[\.\-/_:,\s\*]+', '', name)
-    name = re.sub(r'[\.\-/_:,\s\*]+$', '', name)
+# The "bad word" blacklist
+_AUTHOR_BLACKLIST = [
+    # A. The "Preparation" Problem (Very common in your sample)
+    r"^اعداد", r"^إعداد", r"^اعسداد", r"إشراف", r"تقديم", r"Prepared by",
     
-    # Remove Academic Titles (English & Arabic)
-    # Handle variations: Dr., Dr/, d., د., د/, أ.د, ا.د (Bare Alef)
-    titles_re = r'^\s*(?:Co-Prof|Prof|Dr|Mr|Mrs|Ms|Eng|Assoc|Lecturer|Researcher|Student|Candidate|د\.|أ\.د|ا\.د|بروف|م\.|الذكتور|الاستاذ|الدكتور|الباحث|الطالب|المعلم|د\/|أ\/)\.?\s*'
-    name = re.sub(titles_re, '', name, flags=re.IGNORECASE)
-
-    # --- 2. INSTANT REJECTION RULES ---
+    # B. Database/Repository Boilerplate
+    r"This Article is brought", r"open access", r"rights reserved", r"Creative Commons",
+    r"Edu Search", r"Dar Al Mandumah", r"دار المنظومة", r"معرفة", r"دوريات", r"المجلة",
+    r"brought to you by", r"Digital Commons", r"Copyright",
     
-    # Too short (<3 chars) or contains digits
-    if len(name) < 3: return False, ""
-    if re.search(r'\d', name): return False, "" 
+    # C. Locations (Country names appearing alone)
+    r"Kingdom", r"Republic", r"Saudi", r"Jordan", r"Oman", r"Egypt", r"Algeria", r"Yemen", r"Palestine", r"Kuwait",
+    r"المملكة", r"الجمهورية", r"السعودية", r"الاردن", r"عمان", r"مصر", r"الجزائر", r"السودان", r"اليمن", r"فلسطين", r"الكويت", r"العراق",
     
-    # Email/URL indicators
-    if any(x in name.lower() for x in ['@', 'www.', '.com', '.edu', '.org', '.net']): return False, ""
-
-    # --- 3. THE "BAD WORD" BLACKLIST ---
+    # D. Affiliations (University/College)
+    r"University", r"College", r"Department", r"Faculty", r"Ministry", r"School", r"Institute", r"Deanship",
+    r"جامعة", r"كلية", r"قسم", r"وزارة", r"معهد", r"عمادة", r"رئاسة", r"الجامعة", r"للدراسات",
     
-    bad_patterns = [
-        # A. The "Preparation" Problem (Very common in your sample)
-        r"^اعداد", r"^إعداد", r"^اعسداد", r"إشراف", r"تقديم", r"Prepared by",
-        
-        # B. Database/Repository Boilerplate
-        r"This Article is brought", r"open access", r"rights reserved", r"Creative Commons",
-        r"Edu Search", r"Dar Al Mandumah", r"دار المنظومة", r"معرفة", r"دوريات", r"المجلة",
-        r"brought to you by", r"Digital Commons", r"Copyright",
-        
-        # C. Locations (Country names appearing alone)
-        r"Kingdom", r"Republic", r"Saudi", r"Jordan", r"Oman", r"Egypt", r"Algeria", r"Yemen", r"Palestine", r"Kuwait",
-        r"المملكة", r"الجمهورية", r"السعودية", r"الاردن", r"عمان", r"مصر", r"الجزائر", r"السودان", r"اليمن", r"فلسطين", r"الكويت", r"العراق",
-        
-        # D. Affiliations (University/College)
-        r"University", r"College", r"Department", r"Faculty", r"Ministry", r"School", r"Institute", r"Deanship",
-        r"جامعة", r"كلية", r"قسم", r"وزارة", r"معهد", r"عمادة", r"رئاسة", r"الجامعة", r"للدراسات",
-        
-        # E. Academic Degrees / Roles (Appearing as names)
-        r"Master", r"PhD", r"Thesis", r"Dissertation",
-        r"ماجستير", r"دكتوراه", r"رسالة", r"اطروحة", r"طالب", r"مدرس", r"معلم", r"مدير",
-        
-        # F. Journal Metadata
-        r"Journal", r"Vol", r"Issue", r"No\.", r"pp\.", r"Page", r"ISSN",
-        r"مجلد", r"عدد", r"صفحة", r"طبعة",
-        
-        # G. Abstract/Sentence Starters
-        r"The researcher", r"The study", r"This paper", r"found that", r"aimed to", r"concluded",
-        r"الباحث", r"الدراسة", r"هدفت", r"توصلت", r"نتائج", r"تناول", r"ملخص", r"مقدمة", r"مشكلة",
-        r"The Degree", r"The Level", r"The Impact", r"The Effect", r"Developing",
-        r"درجة", r"أثر", r"فاعلية", r"مستوى", r"واقع", r"تطوير", r"بناء"
-    ]
+    # E. Academic Degrees / Roles (Appearing as names)
+    r"Master", r"PhD", r"Thesis", r"Dissertation",
+    r"ماجستير", r"دكتوراه", r"رسالة", r"اطروحة", r"طالب", r"مدرس", r"معلم", r"مدير",
     
-    # Compile blacklist
-    blacklist_regex = r"(?:" + "|".join(bad_patterns) + r")"
-    if re.search(blacklist_regex, name, re.IGNORECASE):
-        return False, ""
+    # F. Journal Metadata
+    r"Journal", r"Vol", r"Issue", r"No\.", r"pp\.", r"Page", r"ISSN",
+    r"مجلد", r"عدد", r"صفحة", r"طبعة",
+    
+    # G. Abstract/Sentence Starters
+    r"The researcher", r"The study", r"This paper", r"found that", r"aimed to", r"concluded",
+    r"الباحث", r"الدراسة", r"هدفت", r"توصلت", r"نتائج", r"تناول", r"ملخص", r"مقدمة", r"مشكلة",
+    r"The Degree", r"The Level", r"The Impact", r"The Effect", r"Developing",
+    r"درجة", r"أثر", r"فاعلية", r"مستوى", r"واقع", r"تطوير", r"بناء"
+]
+
+_NAME_DIGIT_RE = re.compile(r'\d')
+_NAME_WEB_MARKERS = ('@', 'www.', '.com', '.edu', '.org', '.net')
+_NAME_LOWERCASE_START_RE = re.compile(r'^[a-z]')
+_NAME_LATIN_RE = re.compile(r'[a-zA-Z]')
+_NAME_ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
+
+_LITERAL_PATTERN_RE = re.compile(r'\^?(?:[^\\.^$*+?{}\[\]|()]|\\\W)+')
+
+def _trie_alternation(words) -> str:
+    """Regex matching any of `words`, with shared prefixes factored out (a prefix tree)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+def _compile_word_alternation(patterns, flags: int = 0) -> re.Pattern:
+    """
+    Compiles `patterns` (alternatives of one search) so each position of the text is
+    tried against a prefix tree instead of every branch in turn, behind a lookahead on
+    the possible first characters. It finds a match in exactly the texts where
+    r"(?:p1|p2|...)" does (which branch matches first may differ).
+    Literal patterns (optionally ^-anchored, with escaped punctuation) are merged into
+    the tree; any other pattern is kept as its own branch.
+    """
+    anchored, words, others = [], [], []
+    for pattern in patterns:
+        if not _LITERAL_PATTERN_RE.fullmatch(pattern):
+            others.append(pattern)
+            continue
+        word = re.sub(r"\\(.)", r"\1", pattern.lstrip("^"))
+        # under IGNORECASE ASCII case is irrelevant; folding it lets more prefixes merge
+        if flags & re.IGNORECASE and word.isascii():
+            word = word.lower()
+        (anchored if pattern.startswith("^") else words).append(word)
+
+    branches = []
+    if anchored:
+        branches.append("^" + _trie_alternation(anchored))
+    if words:
+        first_chars = "".join(re.escape(c) for c in sorted({w[0] for w in words}))
+        branches.append(f"(?=[{first_chars}])" + _trie_alternation(words))
+    branches.extend(others)
+    return re.compile("(?:" + "|".join(branches) + ")", flags)
+
+class AuthorNameValidator:
+    """
+    validate_author_name with every pattern compiled once: the ~100 blacklist
+    patterns are one prefix-tree alternation searched in a single pass.
 
-    # --- 4. LINGUISTIC / LOGIC CHECKS ---
+    Usage:
+        validator = AuthorNameValidator()
+        is_valid, name = validator.validate("د. محمد علي")
+        results = validator.validate_many(candidates)
+    """
 
-    # Rule: Lowercase English Check (e.g. "teachers", "motor")
-    if re.match(r'^[a-z]', name): 
-        return False, ""
+    def __init__(self, blacklist=_AUTHOR_BLACKLIST):
+        self.blacklist_re = _compile_word_alternation(blacklist, re.IGNORECASE)
 
-    # Rule: Structure Check
-    tokens = name.split()
-    
-    # Mixed English/Arabic in one name is usually an error (e.g. "The Ability ل")
-    has_eng = bool(re.search(r'[a-zA-Z]', name))
-    has_ara = bool(re.search(r'[\u0600-\u06FF]', name))
-    if has_eng and has_ara:
-        return False, ""
-
-    # Length Check: Names rarely exceed 5 words.
-    if len(tokens) > 5: return False, ""
-    
-    # Single letter check (Too many initials = broken OCR)
-    single_letters = [t for t in tokens if len(t) == 1]
-    if len(single_letters) > 2: return False, ""
+    def validate(self, name_candidate) -> tuple:
+        """
+        Validates if a string is a human name using negative lookups.
+        Updated based on specific failure cases (Edaad, Locations, Degrees).
+
+        Returns:
+            tuple: (is_valid, cleaned name) - ("" when invalid).
+        """
+        if not name_candidate or not isinstance(name_candidate, str):
+            return False, ""
+
+        name = name_candidate.strip()
 
-    return True, name
+        # --- 1. PRE-CLEANING (Aggressive) ---
+        name = _NAME_EDGE_START_RE.sub('', name)
+        name = _NAME_EDGE_END_RE.sub('', name)
+        name = _NAME_TITLES_RE.sub('', name)
+
+        # --- 2. INSTANT REJECTION RULES ---
+
+        # Too short (<3 chars) or contains digits
+        if len(name) < 3: return False, ""
+        if _NAME_DIGIT_RE.search(name): return False, ""
+
+        # Email/URL indicators
+        lowered = name.lower()
+        if any(x in lowered for x in _NAME_WEB_MARKERS): return False, ""
+
+        # --- 3. THE "BAD WORD" BLACKLIST ---
+        if self.blacklist_re.search(name):
+            return False, ""
+
+        # --- 4. LINGUISTIC / LOGIC CHECKS ---
+
+        # Rule: Lowercase English Check (e.g. "teachers", "motor")
+        if _NAME_LOWERCASE_START_RE.match(name):
+            return False, ""
+
+        # Rule: Structure Check
+        tokens = name.split()
+
+        # Mixed English/Arabic in one name is usually an error (e.g. "The Ability ل")
+        if _NAME_LATIN_RE.search(name) and _NAME_ARABIC_RE.search(name):
+            return False, ""
+
+        # Length Check: Names rarely exceed 5 words.
+        if len(tokens) > 5: return False, ""
+
+        # Single letter check (Too many initials = broken OCR)
+        single_letters = [t for t in tokens if len(t) == 1]
+        if len(single_letters) > 2: return False, ""
+
+        return True, name
+
+    __call__ = validate
+
+    def validate_many(self, names) -> list:
+        """validate() over an iterable of candidates; returns the (is_valid, name) tuples in order."""
+        validate = self.validate
+        return [validate(name) for name in names]
+
+AUTHOR_NAME_VALIDATOR = AuthorNameValidator()
+
+def validate_author_name(name_candidate):
+    """
+    Validates if a string is a human name using negative lookups.
+    Updated based on specific failure cases (Edaad, Locations, Degrees).
+    (Shared AuthorNameValidator instance; see AuthorNameValidator.validate.)
+    """
+    return AUTHOR_NAME_VALIDATOR.validate(name_candidate)
+
+# Boundaries of the author zone on page 1
+_AUTHOR_ZONE_STOP_RE = re.compile(r"(?:" + "|".join([
+    r"تاريخ تسلم", r"تاريخ استلام", r"تاريخ قبول", r"Received", r"Accepted",
+    r"ملخص", r"مستخلص", r"Abstract", r"Summary",
+    r"المقدمة", r"مقدمة", r"Introduction", r"Correspondence",
+    r"This Article is brought", r"هدفت الدراسة", r"هدف البحث",
+    r"rights reserved", r"Open Access", r"Creative Commons"
+]) + r")", re.IGNORECASE)
+_ALEF_HAMZA_FORMS_RE = re.compile(r'[أإآ]')
+_ASTERISK_ANCHOR_RE = re.compile(r'\*\s*([^\*\n]+)$', re.MULTILINE)
+# Splitters: Added semicolon and made comma splitting stricter/safer
+_AUTHOR_SPLIT_RE = re.compile(r"(?:\s+و\s+|\s+and\s+|;|،|,|&)")
 
 def extract_authors_heuristic(row):
     """
@@ -429,19 +727,10 @@ def extract_authors_heuristic(row):
     # 1. Preparation
     text = str(row.get('page1', ''))[:2500] 
     search_text = text.replace('ـ', '')
-    search_text = re.sub(r'[أإآ]', 'ا', search_text)
-    
-    # 2. Define Boundaries
-    stop_markers = [
-        r"تاريخ تسلم", r"تاريخ استلام", r"تاريخ قبول", r"Received", r"Accepted",
-        r"ملخص", r"مستخلص", r"Abstract", r"Summary",
-        r"المقدمة", r"مقدمة", r"Introduction", r"Correspondence",
-        r"This Article is brought", r"هدفت الدراسة", r"هدف البحث",
-        r"rights reserved", r"Open Access", r"Creative Commons"
-    ]
+    search_text = _ALEF_HAMZA_FORMS_RE.sub('ا', search_text)
     
-    stop_pattern = r"(?:" + "|".join(stop_markers) + r")"
-    stop_match = re.search(stop_pattern, search_text, re.IGNORECASE)
+    # 2. Boundaries (_AUTHOR_ZONE_STOP_RE)
+    stop_match = _AUTHOR_ZONE_STOP_RE.search(search_text)
     
     if stop_match:
         end_pos = stop_match.start()
@@ -454,7 +743,7 @@ def extract_authors_heuristic(row):
     raw_text = ""
 
     # Strategy A: Asterisk Anchor (*)
-    asterisk_match = re.search(r'\*\s*([^\*\n]+)$', candidate_zone, re.MULTILINE)
+    asterisk_match = _ASTERISK_ANCHOR_RE.search(candidate_zone)
     
     if asterisk_match:
         raw_text = asterisk_match.group(1).strip()
@@ -462,7 +751,7 @@ def extract_authors_heuristic(row):
         # Strategy B: Reverse Line Scan
         lines = [line.strip() for line in candidate_zone.split('\n') if line.strip()]
         for line in reversed(lines):
-            is_valid_structure, _ = validate_author_name(line)
+            is_valid_structure, _ = AUTHOR_NAME_VALIDATOR.validate(line)
             if is_valid_structure:
                 raw_text = line
                 break
@@ -471,21 +760,18 @@ def extract_authors_heuristic(row):
     extracted_authors = []
     
     if raw_text:
-        # Splitters: Added semicolon and made comma splitting stricter/safer
-        splitters = r"(?:\s+و\s+|\s+and\s+|;|،|,|&)"
-        tokens = re.split(splitters, raw_text)
-        
-        for t in tokens:
+        candidates = []
+        for t in _AUTHOR_SPLIT_RE.split(raw_text):
             t = t.strip().strip('*').strip()
             
             # Constraint: Truncate to first 4 words
             name_parts = t.split()
             if len(name_parts) > 4:
                 t = " ".join(name_parts[:4])
+            candidates.append(t)
             
-            # Validation
-            is_valid, cleaned_name = validate_author_name(t)
-            
+        # Validation
+        for is_valid, cleaned_name in AUTHOR_NAME_VALIDATOR.validate_many(candidates):
             if is_valid:
                 extracted_authors.append(cleaned_name)
 
@@ -1,18 +1,33 @@
-from utils.qwen import extract_article_metadata , infer
+from utils.qwen import METADATA_KEYS, extract_article_metadata , infer
+from utils.routing import is_missing, route_row
 import pandas as pd
 import numpy as np
 
-def process_row(row: pd.Series,port=6000,host="localhost") -> pd.Series:
+def process_row(row: pd.Series,port=6000,host="localhost", route: bool = True) -> pd.Series:
     """
     Validates and merges metadata extracted by Qwen with the existing row data.
     Prioritizes existing row content in case of conflicts.
+
+    With `route`, the heuristics run first (see routing.route_row): the LLM is only
+    called when required fields are still missing, and only asked for those.
     """
-    
+    keys = METADATA_KEYS
+    if route:
+        row, keys = route_row(row)
+        if not keys:
+            return row
+
     # 1. Perform the extraction
-    # Assuming extract_article_metadata takes the row or a specific field like 'page1'
-    # Adjust the input argument based on your actual extract_article_metadata signature
-    extracted_data = extract_article_metadata(row["page1"],row["page2"],port,host)
-    
+    extracted_data = extract_article_metadata(row["page1"],row["page2"],port,host,row.get("source"),keys)
+    return merge_extracted_metadata(row, extracted_data)
+
+def merge_extracted_metadata(row: pd.Series, extracted_data: dict) -> pd.Series:
+    """
+    Fills the empty target keys of `row` with the extracted values (None means
+    the extraction failed: the row is returned unchanged).
+    """
+    extracted_data = extracted_data or {}
+
     # 2. Create a copy of the row to update
     updated_row = row.copy()
     
@@ -25,13 +40,7 @@ def process_row(row: pd.Series,port=6000,host="localhost") -> pd.Series:
         
         # Check if the row value is effectively "empty" 
         # (Handles None, NaN, empty strings, or empty lists)
-        is_row_empty = (
-            pd.isna(row_value) or 
-            (isinstance(row_value, str) and row_value.strip() == "") or
-            (isinstance(row_value, list) and len(row_value) == 0)
-        )
-        
-        if is_row_empty:
+        if is_missing(row_value):
             # If the row is empty, fill it with the extracted value
             updated_row[key] = extracted_value
         else:
@@ -48,6 +57,23 @@ import re
 import json
 import re
 
+# Static instructions for fix_authors, kept out of the f-string so every request
+# starts with the same prefix (see qwen.METADATA_SYSTEM_PROMPT); the names come last.
+FIX_AUTHORS_SYSTEM_PROMPT = """You are an expert in Arabic bibliometrics and OCR name correction.
+
+Refine and correct the author names given in the input.
+
+INSTRUCTIONS:
+1. fix the arabic name 
+2. **Noise**: Remove all titles (Dr, Prof, أ.د) and symbols ($, #, *).
+3. **Missing Latin**: If no Latin exists for an Arabic name, generate a standard transliteration.
+4. **Output**: Return ONLY a JSON array of objects.
+
+FORMAT:
+[
+  {"latin": "Latin Name" ,"ar": "Corrected Arabic Name" }
+]"""
+
 def fix_authors(authors_ar_str: str, authors_en_str: str = "", port: int = 6000) -> list:
     """
     Corrects Arabic names using Latin as phonetic ground truth.
@@ -55,34 +81,17 @@ def fix_authors(authors_ar_str: str, authors_en_str: str = "", port: int = 6000)
     if not authors_ar_str or not authors_ar_str.strip():
         return []
 
-    system_instruction = "You are an expert in Arabic bibliometrics and OCR name correction."
-    
-    user_prompt = f"""
-    Refine and correct the following author names.
-
-    INPUT LATIN : "{authors_en_str}"
-    INPUT ARABIC : "{authors_ar_str}"
-
-    INSTRUCTIONS:
-    1. fix the arabic name 
-    2. **Noise**: Remove all titles (Dr, Prof, أ.د) and symbols ($, #, *).
-    3. **Missing Latin**: If no Latin exists for an Arabic name, generate a standard transliteration.
-    4. **Output**: Return ONLY a JSON array of objects.
-
-    FORMAT:
-    [
-      {{"latin": "Latin Name" ,"ar": "Corrected Arabic Name" }}
-    ]
-    """
+    user_prompt = f'INPUT LATIN : "{authors_en_str}"\nINPUT ARABIC : "{authors_ar_str}"'
 
     payload = {
         "model": "/models/Qwen2.5-7B-Instruct-Q4_K_M.gguf",
         "messages": [
-            {"role": "system", "content": system_instruction},
+            {"role": "system", "content": FIX_AUTHORS_SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ],
         "temperature": 0.7, # Keep it low for high fidelity
         "stream": False,
+        "cache_prompt": True,
         "response_format": {"type": "json_object"}
     }
 
@@ -1,29 +1,46 @@
 
 import requests
 import json
+import os
 import re
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from utils.packing import PACK_BUDGET_TOKENS, join_pages, pack_pages, regions_for_keys, verbatim_regions_for_keys
+try:
+    # optional: local tokenization (same vocabulary as the served model)
+    from tokenizers import Tokenizer, Regex, models, normalizers, pre_tokenizers, decoders
+except ImportError:
+    Tokenizer = None
+try:
+    # optional: read the tokenizer straight from the .gguf the server loads
+    import gguf
+except ImportError:
+    gguf = None
 
 """Simplified module for interacting with the LLM API using only port, fixed JSON header, and JSON payload."""
 
 API_HEADER = {"Content-Type": "application/json"}
 
-def infer(payload: dict, port: int = 6000 , host:str="localhost") -> dict:
+_session = requests.Session()
+
+def infer(payload: dict, port: int = 6000 , host:str="localhost", timeout: float = 600) -> dict:
     """
     Send a JSON payload to the LLM API and return the response.
     Args:
         payload (dict): The inference payload.
         port (int): The port for the API endpoint.
+        timeout (float): Seconds to wait for the completion.
     Returns:
         dict: The model's response.
     """
     url = f"http://{host}:{port}/v1/chat/completions"
-    print(url)
     try:
-        response = requests.post(url, headers=API_HEADER, json=payload)
+        response = _session.post(url, headers=API_HEADER, json=payload, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except Exception as e:
-        raise RuntimeError(f"Inference failed: {e}")
+        raise RuntimeError(f"Inference failed ({url}): {e}")
 
 def getTokenCount(text: str, port: int = 6000) -> int:
     """
@@ -50,87 +67,344 @@ def getTokenCount(text: str, port: int = 6000) -> int:
     except Exception as e:
         raise RuntimeError(f"Token count request failed: {e}")
 
+# Tokenizer sources tried in order when load_tokenizer() gets no path.
+# QWEN_TOKENIZER may point to a tokenizer.json or a .gguf file.
+TOKENIZER_CANDIDATES = [
+    os.environ.get("QWEN_TOKENIZER", ""),
+    "models/tokenizer.json",
+    "models/gguf/Qwen2.5-7B-Instruct-Q4_K_M.gguf",
+]
+TOKENIZER_HUB_REPO = "Qwen/Qwen2.5-7B-Instruct"
+
+# Qwen2 pre-tokenizer split, as in the model's tokenizer.json (llama.cpp pre-tokenizer "qwen2")
+_QWEN2_SPLIT = (
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}"
+    r"| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"
+)
+
+def _gguf_strings(field) -> list:
+    return [bytes(field.parts[i]).decode("utf-8") for i in field.data]
+
+def _tokenizer_from_gguf(path: str):
+    """Builds a byte-level BPE tokenizer from the vocabulary and merges embedded in a GGUF file."""
+    if gguf is None:
+        raise ImportError("reading a .gguf tokenizer needs the gguf package (pip install gguf)")
+    reader = gguf.GGUFReader(path)
+    tokens = _gguf_strings(reader.fields["tokenizer.ggml.tokens"])
+    merges = [tuple(m.split(" ", 1)) for m in _gguf_strings(reader.fields["tokenizer.ggml.merges"])]
+    token_types = reader.fields["tokenizer.ggml.token_type"]
+    token_types = [int(token_types.parts[i][0]) for i in token_types.data]
+
+    tokenizer = Tokenizer(models.BPE(vocab={t: i for i, t in enumerate(tokens)}, merges=merges))
+    tokenizer.normalizer = normalizers.NFC()
+    tokenizer.pre_tokenizer = pre_tokenizers.Sequence([
+        pre_tokenizers.Split(Regex(_QWEN2_SPLIT), behavior="isolated"),
+        pre_tokenizers.ByteLevel(add_prefix_space=False, use_regex=False),
+    ])
+    tokenizer.decoder = decoders.ByteLevel()
+    # control tokens (<|im_start|>, <|endoftext|>, ...) are matched whole, like parse_special=True
+    tokenizer.add_special_tokens([t for t, kind in zip(tokens, token_types) if kind == gguf.TokenType.CONTROL])
+    return tokenizer
 
-def extract_article_metadata(page1: str, page2 : str , port: int = 6000 ,host="localhost") -> dict:
+# load_tokenizer failures, remembered per (path, download) for the life of the process:
+# lru_cache does not cache exceptions, and a failed hub download costs its whole retry backoff
+_TOKENIZER_FAILURES = {}
+
+def load_tokenizer(path: str = None, download: bool = None):
     """
-    Extract metadata from two page texts using the local LLM.
+    Loads the Qwen2.5 tokenizer in-process (once per path). A failure is cached
+    too: later calls raise the same error at once instead of searching again.
 
     Args:
-        page1 (str): Text of the first page.
-        page2 (str): Text of the second page.
-        port (int): The port of the running llama.cpp server.
+        path (str): a tokenizer.json or .gguf file. If None, TOKENIZER_CANDIDATES are
+            tried in order.
+        download (bool): if no local file is found, fetch tokenizer.json from the
+            Hugging Face hub. Off by default; None reads QWEN_TOKENIZER_DOWNLOAD=1.
 
     Returns:
-        dict: Extracted metadata in JSON format, or None if failed.
+        tokenizers.Tokenizer: the tokenizer.
+    """
+    if download is None:
+        download = os.environ.get("QWEN_TOKENIZER_DOWNLOAD", "") == "1"
+    key = (path, download)
+    if key in _TOKENIZER_FAILURES:
+        raise _TOKENIZER_FAILURES[key]
+    try:
+        return _load_tokenizer(path, download)
+    except Exception as e:
+        _TOKENIZER_FAILURES[key] = e
+        raise
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(path: str, download: bool):
+    if Tokenizer is None:
+        raise ImportError("local token counting needs the tokenizers package (pip install tokenizers)")
+    candidates = [path] if path else [c for c in TOKENIZER_CANDIDATES if c and os.path.exists(c)]
+    if candidates:
+        if candidates[0].endswith(".gguf"):
+            return _tokenizer_from_gguf(candidates[0])
+        return Tokenizer.from_file(candidates[0])
+    if not download:
+        raise FileNotFoundError("no local tokenizer (set QWEN_TOKENIZER, or QWEN_TOKENIZER_DOWNLOAD=1 to fetch "
+                                f"tokenizer.json of {TOKENIZER_HUB_REPO} from the hub)")
+    from huggingface_hub import hf_hub_download
+    return Tokenizer.from_file(hf_hub_download(TOKENIZER_HUB_REPO, "tokenizer.json"))
+
+def _count_tokens_http(texts: list, port: int, host: str, workers: int) -> list:
+    """One /tokenize call per text over a shared keep-alive session, `workers` requests in flight."""
+    url = f"http://{host}:{port}/tokenize"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=workers))
+
+    def count(text):
+        response = session.post(url, headers=API_HEADER, json={"content": text, "add_special": True, "parse_special": True})
+        response.raise_for_status()
+        return len(response.json().get("tokens", []))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(count, texts))
+    except Exception as e:
+        raise RuntimeError(f"Token count request failed: {e}")
+    finally:
+        session.close()
+
+def count_tokens(texts, tokenizer=None, port: int = 6000, host: str = "localhost", workers: int = 8):
+    """
+    Counts tokens for many texts at once. Uses the local tokenizer (batch-encoded,
+    no server needed); if it cannot be loaded, falls back to the server's /tokenize endpoint.
+    Non-string values count as 0 tokens.
+
+    Args:
+        texts (pd.Series | list): the texts.
+        tokenizer: a loaded tokenizer, a path for load_tokenizer, or None for the default.
+        port (int): llama.cpp server port, used by the HTTP fallback only.
+        host (str): llama.cpp server host, used by the HTTP fallback only.
+        workers (int): concurrent requests for the HTTP fallback.
+
+    Returns:
+        pd.Series | list: token counts, a Series with the same index when given a Series.
+    """
+    values = texts.tolist() if isinstance(texts, pd.Series) else list(texts)
+    strings = [v for v in values if isinstance(v, str)]
+
+    if tokenizer is None or isinstance(tokenizer, str):
+        try:
+            tokenizer = load_tokenizer(tokenizer)
+        except Exception as e:
+            print(f"Local tokenizer unavailable ({e}); counting through http://{host}:{port}/tokenize")
+            tokenizer = None
+
+    if tokenizer is not None:
+        # encode_batch_fast (tokenizers >= 0.20) skips offset tracking, which counting does not need
+        encode = getattr(tokenizer, "encode_batch_fast", tokenizer.encode_batch)
+        counts = [len(encoding.ids) for encoding in encode(strings, add_special_tokens=True)]
+    else:
+        counts = _count_tokens_http(strings, port, host, workers)
+
+    counts = iter(counts)
+    result = [next(counts) if isinstance(v, str) else 0 for v in values]
+    if isinstance(texts, pd.Series):
+        return pd.Series(result, index=texts.index, name=texts.name)
+    return result
+
+
+# Static part of every metadata request. It is sent first and never interpolated,
+# so all requests share a byte-identical prefix that llama.cpp keeps in each slot's
+# KV cache (cache_prompt): only the article text after it is prefilled per request.
+METADATA_SYSTEM_PROMPT = """You are a strict API endpoint for Arabic bibliometrics. Output ONLY raw JSON. Do not use Markdown formatting (```json).
+
+Extract metadata from the input text into this exact JSON structure:
+ignore unidentifiable names and ocr noise in authors.
+
+{
+  "title": "String (Original Arabic title)",
+  "abstract_ar": "String (VERBATIM copy of the Arabic abstract. Do NOT summarize, edit, or truncate. Preserve all original text.)",
+  "general_field": "String (Broad category in ENGLISH, e.g., Law, Medicine)",
+  "authors": ["string", "string",....] (List of names only. Remove titles like Dr., Prof., أ.د, د.),
+  "keywords":["string", "string",....] (list of keywords as they are )
+  "publish_date": "YYYY-MM-DD (Use YYYY-01-01 if only year exists)"
+}"""
+
+# Output caps: characters for strings, (max items, characters per item) for lists.
+# They size max_tokens and are applied to the parsed answer (limit_metadata_fields), not
+# written into the JSON schema: llama.cpp expands every maxLength/maxItems into grammar
+# rules, thousands of them for abstract_ar alone.
+METADATA_FIELD_LIMITS = {
+    "title": 300,
+    "abstract_ar": 2500,   # longest abstract in the corpus: 2177; also capped by the input length
+    "general_field": 60,
+    "authors": (8, 80),
+    "keywords": (10, 60),
+    "publish_date": 10,
+}
+METADATA_KEYS = tuple(METADATA_FIELD_LIMITS)
+
+# Sizing max_tokens from the character caps: Arabic runs 2-3 chars per Qwen token,
+# 2 keeps a margin; plus JSON punctuation and key names.
+CHARS_PER_OUTPUT_TOKEN = 2
+JSON_OVERHEAD_TOKENS = 64
+
+def metadata_json_schema(keys=METADATA_KEYS) -> dict:
+    """
+    JSON schema of the answer, turned into a GBNF grammar by llama.cpp: the output
+    is valid JSON with exactly `keys`, strings or lists of strings, and a
+    YYYY-MM-DD (or empty) publish_date. Lengths are not part of it (see
+    METADATA_FIELD_LIMITS), which keeps the grammar small.
+
+    Args:
+        keys (tuple): the fields to ask for.
+    """
+    properties = {}
+    for key in keys:
+        if key == "publish_date":
+            properties[key] = {"type": "string", "pattern": "^([0-9]{4}-[0-9]{2}-[0-9]{2})?$"}
+        elif isinstance(METADATA_FIELD_LIMITS[key], tuple):
+            properties[key] = {"type": "array", "items": {"type": "string"}}
+        else:
+            properties[key] = {"type": "string"}
+    return {"type": "object", "properties": properties, "required": list(keys), "additionalProperties": False}
+
+def _field_limit(key: str, input_chars: int = None):
+    limit = METADATA_FIELD_LIMITS[key]
+    if key == "abstract_ar" and input_chars is not None:
+        # the abstract is copied from the input, it cannot be longer
+        limit = min(limit, input_chars)
+    return limit
+
+def metadata_max_tokens(input_chars: int, keys=METADATA_KEYS) -> int:
+    """Decode budget for an answer within METADATA_FIELD_LIMITS: its largest possible size, in tokens."""
+    chars = 0
+    for key in keys:
+        limit = _field_limit(key, input_chars)
+        chars += limit[0] * (limit[1] + 4) if isinstance(limit, tuple) else limit
+    return chars // CHARS_PER_OUTPUT_TOKEN + JSON_OVERHEAD_TOKENS
+
+def limit_metadata_fields(metadata: dict, input_chars: int = None) -> dict:
+    """
+    Applies METADATA_FIELD_LIMITS to a parsed answer, in place: strings are cut to
+    their cap, lists to their item count and each item to its cap.
+    """
+    for key, value in metadata.items():
+        if key not in METADATA_FIELD_LIMITS:
+            continue
+        limit = _field_limit(key, input_chars)
+        if isinstance(limit, tuple) and isinstance(value, list):
+            items, chars = limit
+            metadata[key] = [item[:chars] if isinstance(item, str) else item for item in value[:items]]
+        elif isinstance(limit, int) and isinstance(value, str):
+            metadata[key] = value[:limit]
+    return metadata
+
+def response_content(response_data: dict) -> str:
+    """The answer text; warns when the model hit max_tokens (the JSON is then cut short)."""
+    choice = response_data['choices'][0]
+    if choice.get('finish_reason') == 'length':
+        print("Warning: generation stopped at max_tokens, output is truncated.")
+    return choice['message']['content']
+
+def build_metadata_payload(page1: str, page2: str, source: str = None,
+                           budget_tokens: int = PACK_BUDGET_TOKENS, keys=METADATA_KEYS) -> dict:
+    """
+    Builds the chat payload asking the model for the article metadata.
+    The system message is the fixed METADATA_SYSTEM_PROMPT; the article text is the
+    user message, so it comes last.
+
+    Args:
+        page1 (str), page2 (str): the page texts.
+        source (str): journal code; when given, only the pinpointed regions are sent
+            (see packing.pack_pages), otherwise the two full pages.
+        budget_tokens (int): token cap for the pinpointed regions.
+        keys (tuple): the fields to extract (see routing.route_row); the schema,
+            the decode budget and the regions sent are limited to them.
+
+    Returns:
+        dict: the payload, or None if both pages are empty or no key is asked for.
     """
     pages = [page1,page2]
     # 1. Validation & Pre-processing
-    if not pages or all(not p.strip() for p in pages):
-        print("Warning: Received empty page list.")
-        return {}
+    if not pages or all(not p.strip() for p in pages) or not keys:
+        return None
+    keys = tuple(key for key in METADATA_KEYS if key in keys)
 
     # We only need the first 2 pages for metadata (Title, Abstract, Authors usually appear here).
-    # Joining with a separator helps the model understand page breaks, though not strictly necessary.
-    joined_text = "\n--- PAGE BREAK ---\n".join(pages[:2])
+    # With a known source, the pinpointed regions replace them (falling back to the full pages).
+    if source:
+        joined_text, _ = pack_pages(page1, page2, source, budget_tokens, regions_for_keys(keys),
+                                    verbatim_regions_for_keys(keys))
+    else:
+        joined_text = join_pages(page1, page2)
 
-    # 2. Redefined 
-    
-    system_instruction = (
-        "You are a strict API endpoint for Arabic bibliometrics. "
-        "Output ONLY raw JSON. Do not use Markdown formatting (```json)."
-    )
-    
-    user_prompt = f"""
-    Extract metadata from the text below into this exact JSON structure:
-    ignore unidentifiable names and ocr noise in authors. 
-    
-    {{
-      "title": "String (Original Arabic title)",
-      "abstract_ar": "String (VERBATIM copy of the Arabic abstract. Do NOT summarize, edit, or truncate. Preserve all original text.)",
-      "general_field": "String (Broad category in ENGLISH, e.g., Law, Medicine)",
-      "authors": ["string", "string",....] (List of names only. Remove titles like Dr., Prof., أ.د, د.),
-      "keywords":["string", "string",....] (list of keywords as they are )
-      "publish_date": "YYYY-MM-DD (Use YYYY-01-01 if only year exists)"
-    }}
-    
-    ### INPUT TEXT:
-    \"\"\"
-    {joined_text}
-    \"\"\"
-    """
+    user_prompt = f'### INPUT TEXT:\n"""\n{joined_text}\n"""'
+    if keys != METADATA_KEYS:
+        # after the cached system prefix, so a partial request still reuses it
+        user_prompt = f"### EXTRACT ONLY: {', '.join(keys)}\n" + user_prompt
+    schema = metadata_json_schema(keys)
 
     # 3. Construct Payload
     payload = {
         "model": "/models/Qwen2.5-7B-Instruct-Q4_K_M.gguf", # Ensure this matches your container path
         "messages": [
-            {"role": "system", "content": system_instruction},
+            {"role": "system", "content": METADATA_SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ],
         "temperature": 0.1,    # Low temp for factual extraction
-        #"max_tokens": 2048,    # Enough for abstract + metadata
+        "max_tokens": metadata_max_tokens(len(joined_text), keys),  # the largest answer within the caps
         "stream": False,
-        "response_format": {"type": "json_object"}
+        "cache_prompt": True,  # reuse the slot's KV cache for the shared prefix
+        # grammar-constrained decoding: always valid JSON with the asked keys
+        "response_format": {"type": "json_schema", "json_schema": {"name": "article_metadata", "schema": schema}}
     }
+    return payload
+
+def parse_metadata_content(content: str) -> dict:
+    """
+    Parses the model's answer into a dict, with its fields cut to METADATA_FIELD_LIMITS.
+    Raises json.JSONDecodeError if it is not valid JSON.
+    """
+    # Regex to extract JSON block in case the model adds "Here is your JSON:" chatter
+    json_match = re.search(r"\{.*\}", content, re.DOTALL)
+    
+    if json_match:
+        clean_json_str = json_match.group(0)
+        metadata = json.loads(clean_json_str)
+    else:
+        # Fallback: try parsing the whole string
+        metadata = json.loads(content)
+    return limit_metadata_fields(metadata) if isinstance(metadata, dict) else metadata
+
+def extract_article_metadata(page1: str, page2 : str , port: int = 6000 ,host="localhost", source: str = None,
+                             keys=METADATA_KEYS) -> dict:
+    """
+    Extract metadata from two page texts using the local LLM.
+
+    Args:
+        page1 (str): Text of the first page.
+        page2 (str): Text of the second page.
+        port (int): The port of the running llama.cpp server.
+        source (str): journal code, to send only the pinpointed regions.
+        keys (tuple): the fields to extract.
+
+    Returns:
+        dict: Extracted metadata in JSON format, or None if failed.
+    """
+    payload = build_metadata_payload(page1, page2, source, keys=keys)
+    if payload is None:
+        print("Warning: Received empty page list.")
+        return {}
 
     # 4. Call Inference
+    content = None
     try:
         response_data = infer(payload, port=port,host=host)
-        content = response_data['choices'][0]['message']['content']
+        content = response_content(response_data)
 
         # 5. Parse and Clean Response
-        # Regex to extract JSON block in case the model adds "Here is your JSON:" chatter
-        json_match = re.search(r"\{.*\}", content, re.DOTALL)
-        
-        if json_match:
-            clean_json_str = json_match.group(0)
-            return json.loads(clean_json_str)
-        else:
-            # Fallback: try parsing the whole string
-            return json.loads(content)
+        return parse_metadata_content(content)
 
     except json.JSONDecodeError:
         print(f"Error: Model output was not valid JSON.\nRaw Output: {content}")
         return None
     except Exception as e:
         print(f"Error during extraction: {e}")
-        return None
\ No newline at end of file
+        return None
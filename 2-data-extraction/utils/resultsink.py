@@ -0,0 +1,149 @@
+"""Append-only result store for the per-article LLM stage, indexed by article_id."""
+
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+class ResultSink:
+    """
+    Stores one JSON record per article in SQLite (WAL mode).
+
+    - `article_id in sink` is a set lookup: the ids are loaded once when the
+      sink opens, so resume checks do not grow with the output.
+    - Writes are batched: a commit (and its fsync) happens every `commit_every`
+      records or `commit_seconds`, whichever comes first, and on close.
+    - A crash loses at most the uncommitted batch; a record is either fully
+      stored or absent, never half-written.
+
+    Usage:
+        with ResultSink("metadata-extraction-output/results.sqlite") as sink:
+            if article_id not in sink:
+                sink.put(article_id, record, group="chunk_3")
+    """
+
+    def __init__(self, path: str, commit_every: int = 20, commit_seconds: float = 5.0):
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_seconds = commit_seconds
+        self._conn = None
+        self._ids = set()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def open(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    article_id INTEGER PRIMARY KEY,
+                    grp TEXT,
+                    record TEXT NOT NULL,
+                    written_at REAL NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+            self._ids = {row[0] for row in conn.execute("SELECT article_id FROM results")}
+        return self
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __contains__(self, article_id) -> bool:
+        return int(article_id) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def put(self, article_id, record, group: str = None):
+        """
+        Stores (or replaces) the record of one article. `record` is a dict or a
+        pd.Series; NaN values are stored as null.
+        """
+        if isinstance(record, pd.Series):
+            payload = record.to_json(force_ascii=False, default_handler=str)
+        else:
+            payload = json.dumps(record, ensure_ascii=False, default=str)
+        article_id = int(article_id)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (article_id, grp, record, written_at) VALUES (?, ?, ?, ?)",
+            (article_id, group, payload, time.time()),
+        )
+        self._ids.add(article_id)
+        self._uncommitted += 1
+        if (self._uncommitted >= self.commit_every
+                or time.monotonic() - self._last_commit >= self.commit_seconds):
+            self.flush()
+
+    def flush(self):
+        """Commits the pending records."""
+        if self._uncommitted:
+            self._conn.commit()
+            self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def to_frame(self, group: str = None) -> pd.DataFrame:
+        """All records (of one group, if given) as a DataFrame, in article_id order."""
+        self.flush()
+        query, params = "SELECT record FROM results", ()
+        if group is not None:
+            query, params = query + " WHERE grp = ?", (group,)
+        records = [json.loads(row[0]) for row in self._conn.execute(query + " ORDER BY article_id", params)]
+        return pd.DataFrame.from_records(records)
+
+    def groups(self) -> list:
+        self.flush()
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT grp FROM results ORDER BY grp")]
+
+    def import_csv(self, path: str, group: str = None) -> int:
+        """Loads an existing results CSV (e.g. a legacy chunk_<i>_processed.csv); returns rows added."""
+        if not os.path.exists(path) or os.stat(path).st_size == 0:
+            return 0
+        added = 0
+        for _, row in pd.read_csv(path).iterrows():
+            if row["article_id"] not in self:
+                self.put(row["article_id"], row, group)
+                added += 1
+        self.flush()
+        return added
+
+def open_chunk_sink(output_folder: str, **kwargs) -> ResultSink:
+    """
+    Opens output_folder/results.sqlite. On first use, rows already written to
+    chunk_<i>_processed.csv files by earlier runs are imported, so no work is redone.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    sink = ResultSink(os.path.join(output_folder, "results.sqlite"), **kwargs).open()
+    if len(sink) == 0:
+        for path in sorted(glob.glob(os.path.join(output_folder, "chunk_*_processed.csv"))):
+            match = re.fullmatch(r"(chunk_\d+)_processed\.csv", os.path.basename(path))
+            if match:
+                sink.import_csv(path, match.group(1))
+    return sink
+
+def export_chunk_csvs(sink: ResultSink, output_folder: str) -> list:
+    """Writes each group back out as output_folder/<group>_processed.csv; returns the paths."""
+    paths = []
+    for group in sink.groups():
+        if group is None:
+            continue
+        path = os.path.join(output_folder, f"{group}_processed.csv")
+        sink.to_frame(group).to_csv(path, index=False)
+        paths.append(path)
+    return paths
@@ -0,0 +1,134 @@
+"""Heuristics-first routing: fill what the regex extractors find reliably, leave only the rest to the LLM."""
+
+import re
+
+import pandas as pd
+
+from utils.preprocessing import extract_abstract, extract_keywords, extract_authors_heuristic
+from utils.qwen import METADATA_KEYS
+
+# A row is sent to the LLM only when one of these is still missing after the
+# heuristics. title, general_field and publish_date are asked for in the same
+# request when it happens, but never cause one on their own: no heuristic fills
+# them, and no later stage reads them (06-data-extraction-final has no title).
+LLM_REQUIRED_KEYS = ("abstract_ar", "authors", "keywords")
+
+# Heuristic values scoring below this are discarded and left to the LLM
+MIN_CONFIDENCE = 0.8
+
+_ARABIC_LETTER_RE = re.compile(r"[\u0621-\u064A]")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_NAME_RE = re.compile(r"[^\W\d_]+(?:[ '\-][^\W\d_]+)*")
+_LOWERCASE_WORD_RE = re.compile(r"(?:^|\s)[a-z]")
+# Openings of an abstract found by its purpose verb (هدفت, يهدف, استهدف, سعت, تناول, ...) or its header
+_ABSTRACT_OPENER_RE = re.compile(r"^\W*(?:\w{0,4}هد[فق]|\w{0,2}سع[اىت]|\w{0,2}تناول|\w{0,2}رك[زت]|\w{0,2}ملخص|\w{0,2}مستخلص|aim|this stud|the stud|purpose|objective)", re.IGNORECASE)
+# Words that do not occur in a person's name but do in the affiliation/title lines
+# extract_authors_heuristic sometimes returns (normalized spelling: ه for ة, ا for أ/إ/آ)
+_NOT_A_NAME_RE = re.compile(r"(?:^|\s)(?:جامع[هة]|كلي[هة]|قسم|معهد|مدرس[هة]|الصف|طلاب|طلب[هة]|في|من|علا|على|الا|الى|ظل|وعلاقتها|بال\w+)(?:\s|$)")
+
+def is_missing(value) -> bool:
+    """True for None, NaN, blank strings and empty lists: a field the pipeline still has to fill."""
+    # lists are tested first: pd.isna on a list returns an array, not a bool
+    if isinstance(value, (list, tuple)):
+        return len(value) == 0
+    if isinstance(value, str):
+        return value.strip() == "" or value.strip().lower() == "nan"
+    return value is None or bool(pd.isna(value))
+
+def _arabic_share(text: str) -> float:
+    letters = len(_LETTER_RE.findall(text))
+    return len(_ARABIC_LETTER_RE.findall(text)) / letters if letters else 0.0
+
+def abstract_confidence(abstract) -> float:
+    """
+    0..1: how much an extract_abstract result looks like a whole Arabic abstract.
+    Penalizes English/OCR-noise text, implausible lengths, and windows that do not
+    start like an abstract (the fallback search sometimes lands mid-paragraph).
+    """
+    if not isinstance(abstract, str) or len(abstract) < 100:
+        return 0.0
+    score = _arabic_share(abstract)
+    if not 300 <= len(abstract) <= 2500:
+        score *= 0.7
+    if not _ABSTRACT_OPENER_RE.match(abstract):
+        score *= 0.7
+    return score
+
+def keywords_confidence(keywords) -> float:
+    """
+    0..1: share of items that look like single keywords (1-5 words, < 60 chars,
+    no inner "." left by an OCR'd separator). A single item is an unsplit line
+    (OCR dropped the separators) and scores low.
+    """
+    if not isinstance(keywords, list) or not keywords:
+        return 0.0
+    good = sum(1 for k in keywords if 1 <= len(k.split()) <= 5 and len(k) < 60 and "." not in k and _LETTER_RE.search(k))
+    score = good / len(keywords)
+    return score if len(keywords) >= 2 else score * 0.3
+
+def authors_confidence(authors) -> float:
+    """
+    0..1: share of names made of 2-4 letter-only words, in one script, with no
+    affiliation or title words (Latin ones capitalized); 0 beyond 8 names.
+    A lone name scores lower: the line scan often stops at the first of several authors.
+    """
+    if not isinstance(authors, list) or not authors or len(authors) > 8:
+        return 0.0
+    good = 0
+    for name in authors:
+        words = name.strip().split()
+        if (2 <= len(words) <= 4 and _NAME_RE.fullmatch(name.strip())
+                and _arabic_share(name) in (0.0, 1.0) and not _NOT_A_NAME_RE.search(name)
+                and not _LOWERCASE_WORD_RE.search(name)):
+            good += 1
+    score = good / len(authors)
+    return score if len(authors) >= 2 else score * 0.75
+
+# field -> (extractor taking the row, confidence of its result)
+HEURISTICS = {
+    "abstract_ar": (extract_abstract, abstract_confidence),
+    "keywords": (extract_keywords, keywords_confidence),
+    "authors": (extract_authors_heuristic, authors_confidence),
+}
+
+def route_row(row: pd.Series, min_confidence: float = MIN_CONFIDENCE,
+              required_keys=LLM_REQUIRED_KEYS) -> tuple:
+    """
+    Fills the missing fields of `row` the heuristics can resolve and decides what
+    is left for the LLM.
+
+    Args:
+        row (pd.Series): an article with page1/page2 and the METADATA_KEYS columns.
+        min_confidence (float): heuristic results scoring lower are not used.
+        required_keys (tuple): the LLM is called only if one of these is still missing.
+
+    Returns:
+        tuple: (row, keys) - a copy of the row with the confident heuristic values
+            filled in, and the METADATA_KEYS to ask the LLM for (empty: no call needed).
+    """
+    # object dtype: list values cannot be set into a row of string dtype
+    row = row.astype(object)
+    for key, (extract, confidence) in HEURISTICS.items():
+        if is_missing(row.get(key)):
+            value = extract(row)
+            if confidence(value) >= min_confidence:
+                row[key] = value
+    missing = tuple(key for key in METADATA_KEYS if is_missing(row.get(key)))
+    if not any(key in required_keys for key in missing):
+        return row, ()
+    return row, missing
+
+def route_frame(df: pd.DataFrame, **kwargs) -> tuple:
+    """
+    route_row over a DataFrame.
+
+    Returns:
+        tuple: (df, keys) - the filled DataFrame, and a Series (same index) with the
+            tuple of keys each row still needs from the LLM.
+    """
+    rows, keys = [], []
+    for _, row in df.iterrows():
+        routed, missing = route_row(row, **kwargs)
+        rows.append(routed)
+        keys.append(missing)
+    return pd.DataFrame(rows, index=df.index), pd.Series(keys, index=df.index, dtype=object)
@@ -0,0 +1,285 @@
+"""Metadata extraction over several llama.cpp servers fed from one shared work queue."""
+
+import asyncio
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pandas as pd
+
+from utils.llmclient import AsyncLLMClient
+from utils.processing import merge_extracted_metadata
+from utils.qwen import METADATA_KEYS, build_metadata_payload, parse_metadata_content, response_content
+from utils.resultsink import open_chunk_sink, export_chunk_csvs
+from utils.routing import route_row
+
+class Endpoint:
+    """One llama.cpp server: address, slot count and live statistics."""
+
+    def __init__(self, host: str, port: int, slots: int = 1):
+        self.host, self.port, self.slots = host, int(port), int(slots)
+        self.done = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.busy_seconds = 0.0
+        self.latency_ewma = None
+        # from llama.cpp's "timings": prompt tokens prefilled, tokens reused from the slot cache
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.prefill_ms = 0.0
+        self.started_at = None
+        self.drained = None  # reason, once the endpoint stops taking work
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def record_success(self, seconds: float, alpha: float = 0.2):
+        self.done += 1
+        self.consecutive_failures = 0
+        self.busy_seconds += seconds
+        self.latency_ewma = seconds if self.latency_ewma is None else alpha * seconds + (1 - alpha) * self.latency_ewma
+
+    def record_timings(self, timings: dict):
+        if timings:
+            self.prompt_tokens += timings.get("prompt_n", 0)
+            self.cached_tokens += timings.get("cache_n", 0)
+            self.prefill_ms += timings.get("prompt_ms", 0.0)
+
+    def record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            "endpoint": self.name,
+            "slots": self.slots,
+            "done": self.done,
+            "failures": self.failures,
+            "latency_s": round(self.busy_seconds / self.done, 2) if self.done else None,
+            "rows_per_min": round(60 * self.done / elapsed, 2) if elapsed else 0.0,
+            "prefill_ms": round(self.prefill_ms / self.done) if self.done else None,
+            "cached_share": round(self.cached_tokens / (self.cached_tokens + self.prompt_tokens), 2)
+                            if self.cached_tokens + self.prompt_tokens else None,
+            "drained": self.drained,
+        }
+
+def parse_endpoints(endpoints, slots: int = 1) -> list:
+    """
+    Accepts "host:port", "host:port/slots", (host, port) or (host, port, slots) items.
+    """
+    parsed = []
+    for item in endpoints:
+        if isinstance(item, Endpoint):
+            parsed.append(item)
+        elif isinstance(item, str):
+            match = re.fullmatch(r"(.+):(\d+)(?:/(\d+))?", item.strip())
+            if not match:
+                raise ValueError(f"Bad endpoint {item!r}, expected host:port or host:port/slots")
+            parsed.append(Endpoint(match.group(1), match.group(2), match.group(3) or slots))
+        else:
+            parsed.append(Endpoint(*item) if len(item) == 3 else Endpoint(item[0], item[1], slots))
+    return parsed
+
+def _input_chunks(input_folder: str) -> list:
+    """[(group, input path)] for every chunk_<i>.csv, in index order; group is "chunk_<i>"."""
+    chunks = []
+    for path in glob.glob(os.path.join(input_folder, "chunk_*.csv")):
+        match = re.fullmatch(r"chunk_(\d+)\.csv", os.path.basename(path))
+        if match:
+            chunks.append((int(match.group(1)), path))
+    return [(f"chunk_{i}", path) for i, path in sorted(chunks)]
+
+class MetadataScheduler:
+    """
+    Runs the metadata extraction of every pending row of the input chunks on a
+    pool of endpoints. Each endpoint gets one worker per slot; a worker takes the
+    next row from the shared queue as soon as its previous request returns, so
+    faster servers naturally process more rows.
+
+    An endpoint is drained (finishes its in-flight rows, then takes no new ones) when
+      - it failed `max_failures` requests in a row (after the client's own retries;
+        the failed rows go back to the queue), or
+      - its latency is more than `slow_factor` times the fastest endpoint's, once both
+        have `min_samples` completions and some other endpoint is still healthy.
+    A row rejected by the server (4xx) or failing `max_failures` times overall is
+    skipped and left for the next run.
+
+    With `route`, every row goes through routing.route_row before being queued:
+    rows the heuristics complete are stored without a request, the others only
+    ask the model for their missing fields.
+    """
+
+    def __init__(self, endpoints, input_folder: str = "metadata-extraction-input",
+                 output_folder: str = "metadata-extraction-output", slots: int = 1,
+                 max_failures: int = 3, slow_factor: float = 3.0, min_samples: int = 5,
+                 report_every: int = 50, route: bool = True, **client_kwargs):
+        self.endpoints = parse_endpoints(endpoints, slots)
+        self.input_folder = input_folder
+        self.output_folder = output_folder
+        self.max_failures = max_failures
+        self.slow_factor = slow_factor
+        self.min_samples = min_samples
+        self.report_every = report_every
+        self.route = route
+        self.client_kwargs = {"retries": 2, **client_kwargs}
+        self.completed = 0
+        self.resolved_by_heuristics = 0
+        self._sink = None
+
+    def _load_queue(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        for group, input_path in _input_chunks(self.input_folder):
+            df = pd.read_csv(input_path)
+            remaining = df[[article_id not in self._sink for article_id in df["article_id"]]]
+            queued = 0
+            for _, row in remaining.iterrows():
+                keys = METADATA_KEYS
+                if self.route:
+                    row, keys = route_row(row)
+                    if not keys:
+                        self._sink.put(row["article_id"], row, group)
+                        self.resolved_by_heuristics += 1
+                        continue
+                queue.put_nowait((row, keys, group, 0))
+                queued += 1
+            print(f"{group}: {len(df) - len(remaining)} done, "
+                  f"{len(remaining) - queued} resolved by heuristics, {queued} queued")
+        return queue
+
+    def _healthy(self) -> list:
+        return [e for e in self.endpoints if e.drained is None]
+
+    def _check_drain(self, endpoint: Endpoint):
+        if endpoint.drained is not None:
+            return
+        if endpoint.consecutive_failures >= self.max_failures:
+            endpoint.drained = f"dead ({endpoint.consecutive_failures} failures in a row)"
+        elif endpoint.done >= self.min_samples:
+            others = [e for e in self._healthy() if e is not endpoint and e.done >= self.min_samples]
+            if others:
+                fastest = min(e.latency_ewma for e in others)
+                if endpoint.latency_ewma > self.slow_factor * fastest:
+                    endpoint.drained = f"slow ({endpoint.latency_ewma:.1f}s vs {fastest:.1f}s)"
+        if endpoint.drained:
+            print(f"Draining {endpoint.name}: {endpoint.drained}")
+
+    async def _extract(self, client: AsyncLLMClient, row: pd.Series, payload: dict) -> tuple:
+        """
+        The metadata answer to `payload` (built by build_metadata_payload for `row`),
+        plus the server's timings. Server errors raise; an unparsable answer gives None.
+        """
+        if payload is None:
+            return {}, None
+        response_data = await client.chat(payload)
+        content = response_content(response_data)
+        try:
+            return parse_metadata_content(content), response_data.get("timings")
+        except json.JSONDecodeError:
+            print(f"Error: Model output was not valid JSON.\nRaw Output: {content}")
+            return None, response_data.get("timings")
+
+    async def _worker(self, endpoint: Endpoint, client: AsyncLLMClient, queue: asyncio.Queue):
+        while endpoint.drained is None:
+            try:
+                row, keys, group, attempts = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                payload = build_metadata_payload(row["page1"], row["page2"], row.get("source"), keys=keys)
+            except Exception as e:
+                # bad row data (e.g. a NaN page), not a server problem: the endpoint is not blamed
+                print(f"article {row['article_id']}: request could not be built ({e!r}), skipped")
+                continue
+            start = time.monotonic()
+            try:
+                extracted, timings = await self._extract(client, row, payload)
+            except httpx.HTTPStatusError as e:
+                # the server is fine, this request is not (e.g. prompt longer than the context)
+                print(f"{endpoint.name}: article {row['article_id']} rejected ({e}), skipped")
+                continue
+            except Exception as e:
+                endpoint.record_failure()
+                if attempts + 1 < self.max_failures:
+                    print(f"{endpoint.name}: article {row['article_id']} failed ({e}), re-queued")
+                    queue.put_nowait((row, keys, group, attempts + 1))
+                else:
+                    print(f"{endpoint.name}: article {row['article_id']} failed {attempts + 1} times, skipped")
+                self._check_drain(endpoint)
+                continue
+            endpoint.record_success(time.monotonic() - start)
+            endpoint.record_timings(timings)
+            self._sink.put(row["article_id"], merge_extracted_metadata(row, extracted), group)
+            self.completed += 1
+            if self.report_every and self.completed % self.report_every == 0:
+                print(f"{self.completed} rows done, {queue.qsize()} queued | " + " | ".join(
+                    f"{e.name}: {e.done} ({e.latency_ewma or 0:.1f}s)" for e in self.endpoints))
+            self._check_drain(endpoint)
+
+    async def _run_endpoint(self, endpoint: Endpoint, queue: asyncio.Queue):
+        endpoint.started_at = time.monotonic()
+        async with AsyncLLMClient(endpoint.host, endpoint.port, concurrency=endpoint.slots,
+                                  **self.client_kwargs) as client:
+            await asyncio.gather(*(self._worker(endpoint, client, queue) for _ in range(endpoint.slots)))
+
+    async def run_async(self) -> pd.DataFrame:
+        """Processes the queue until it is empty (or every endpoint is drained); returns per-endpoint stats."""
+        self._sink = open_chunk_sink(self.output_folder)
+        try:
+            await self._drain_queue(self._load_queue())
+        finally:
+            export_chunk_csvs(self._sink, self.output_folder)
+            self._sink.close()
+        return pd.DataFrame([e.stats() for e in self.endpoints])
+
+    async def _drain_queue(self, queue: asyncio.Queue):
+        # a row re-queued by an endpoint that then drained is picked up by the remaining ones;
+        # loop until the queue is empty or nobody is left to serve it
+        while not queue.empty():
+            if not self._healthy():
+                # every fast endpoint died: a slow endpoint is better than none
+                for endpoint in self.endpoints:
+                    if endpoint.drained and endpoint.drained.startswith("slow"):
+                        endpoint.drained = None
+                if not self._healthy():
+                    break
+            await asyncio.gather(*(self._run_endpoint(e, queue) for e in self._healthy()))
+        if not queue.empty():
+            print(f"Stopped with {queue.qsize()} rows left: every endpoint was drained")
+
+    def run(self) -> pd.DataFrame:
+        """Blocking version of run_async; works inside Jupyter's running event loop too."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_async())
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.run_async()).result()
+
+def run_metadata_extraction(endpoints, input_folder: str = "metadata-extraction-input",
+                            output_folder: str = "metadata-extraction-output", slots: int = 1,
+                            **kwargs) -> pd.DataFrame:
+    """
+    Extracts metadata for every pending row of input_folder/chunk_*.csv using all
+    `endpoints` at once. Results go to output_folder/results.sqlite (see ResultSink)
+    as they complete and are exported to output_folder/chunk_<i>_processed.csv
+    when the run ends. Articles already in the sink are skipped.
+
+    Args:
+        endpoints (list): "host:port", "host:port/slots", (host, port) or (host, port, slots).
+        input_folder (str): folder with the chunk_<i>.csv files.
+        output_folder (str): folder for the chunk_<i>_processed.csv files.
+        slots (int): default slots per endpoint (the server's parallel slot count).
+        **kwargs: MetadataScheduler options (max_failures, slow_factor, route, ...) and
+            AsyncLLMClient options (timeout, retries, backoff).
+
+    Returns:
+        pd.DataFrame: per-endpoint stats (done, failures, mean latency, rows/min, mean
+            prefill time, share of prompt tokens served from the KV cache, drain reason).
+    """
+    return MetadataScheduler(endpoints, input_folder, output_folder, slots, **kwargs).run()
@@ -83,6 +83,7 @@ from sklearn.metrics.pairwise import cosine_similarity
 # 1. Load the splits
 train_df = pd.read_csv('02-train.csv')
 test_df = pd.read_csv('02-test.csv')
+authors = pd.read_csv('00-authors.csv')
 
 # 2. Re-parse author_ids (since CSV saves lists as strings)
 def parse_list(s):
@@ -92,12 +93,32 @@ def parse_list(s):
 train_df['author_ids'] = train_df['author_ids'].apply(parse_list)
 test_df['author_ids'] = test_df['author_ids'].apply(parse_list)
 
-# 3. Fit TF-IDF on Training Data
-# We use sublinear_tf to scale counts and min_df to ignore very rare typos
-tfidf = TfidfVectorizer(sublinear_tf=True, min_df=2, ngram_range=(1, 1)) 
-tfidf_matrix = tfidf.fit_transform(train_df['text_for_tfidf'].fillna(''))
+# 3-5. Load the model bundle fitted on this exact training corpus (memory-mapped, starts in
+# milliseconds); refit and save it only when it is missing or the corpus changed
+from retrieval import SparseSearchEngine
+from recommender import AuthorIndex
+from bundle import corpus_hash, load_model, save_model
 
-print(f"Model fitted. Vocabulary size: {len(tfidf.vocabulary_)}")
+MODEL_PATH = '04-model'
+try:
+    engine, index, manifest = load_model(MODEL_PATH, expected_corpus_hash=corpus_hash(train_df['text_for_tfidf']))
+    tfidf = engine.vectorizer
+    print(f"Model loaded from {MODEL_PATH} (fitted {manifest['created']}).")
+except (FileNotFoundError, ValueError) as e:
+    print(f"Fitting the model ({e})")
+    # 3. Fit TF-IDF on Training Data
+    # We use sublinear_tf to scale counts and min_df to ignore very rare typos
+    tfidf = TfidfVectorizer(sublinear_tf=True, min_df=2, ngram_range=(1, 1))
+    tfidf_matrix = tfidf.fit_transform(train_df['text_for_tfidf'].fillna(''))
+
+    # 4. Index the training rows for top-k search
+    engine = SparseSearchEngine(tfidf, tfidf_matrix)
+
+    # 5. Index their authors once: integer author codes, names, author -> articles
+    index = AuthorIndex(train_df['article_id'], train_df['author_ids'], authors)
+    save_model(MODEL_PATH, engine, index, train_df['text_for_tfidf'])
+
+print(f"Model ready. Vocabulary size: {len(tfidf.vocabulary_)}")
 
 
 # In[67]:
@@ -112,34 +133,31 @@ def recommend_reviewer_logic_verbose(query_text, k_depth=20):
     print("STARTING RECOMMENDATION PROCESS")
     print("-" * 60)
 
-    # 1. Vectorize input
-    query_vec = tfidf.transform([query_text])
-
-    # 2. Calculate similarities
-    similarities = cosine_similarity(query_vec, tfidf_matrix).flatten()
+    # 1-3. Vectorize input and get the Top K articles with their similarities
+    # (sparse dot product over the query terms' postings + argpartition, see retrieval.py)
+    top_indices, top_scores = engine.search(query_text, k_depth)
 
-    # 3. Get Top K indices
-    top_indices = similarities.argsort()[::-1][:k_depth]
+    # Safety check for zero similarity (no training article shares a term with the query)
+    if len(top_indices) == 0:
+        print("[ERROR] No similar articles found (Score is 0).")
+        return None, None, "No Matches"
 
     # 4. STEP 1: Anchor Candidates
     best_match_idx = top_indices[0]
-    best_score = similarities[best_match_idx]
-    best_article_id = train_df.iloc[best_match_idx]['article_id']
-    candidates = set(train_df.iloc[best_match_idx]['author_ids'])
+    best_score = top_scores[0]
+    best_article_id = index.article_ids[best_match_idx]
+    candidates = index.authors_of(best_match_idx)  # sorted author codes
 
     print(f"[STEP 1] ANCHOR MATCH FOUND")
     print(f"Nearest Article ID: {best_article_id}")
     print(f"Similarity Score:   {best_score:.4f}")
-    print(f"Initial Candidates: {candidates}")
+    print(f"Initial Candidates: {set(index.ids[candidates])}")
+
 
-    # Safety check for zero similarity
-    if best_score == 0:
-        print("[ERROR] No similar articles found (Score is 0).")
-        return None, None, "No Matches"
 
     # If article 1 has only one author, return immediately
     if len(candidates) == 1:
-        winner = list(candidates)[0]
+        winner = index.ids[candidates[0]]
         print(f"[RESULT] Unique author found in nearest article. Selecting: {winner}")
         return winner, best_article_id, "Direct Match"
 
@@ -149,35 +167,35 @@ def recommend_reviewer_logic_verbose(query_text, k_depth=20):
 
     for i in range(1, len(top_indices)):
         next_match_idx = top_indices[i]
-        next_score = similarities[next_match_idx]
-        next_id = train_df.iloc[next_match_idx]['article_id']
-        next_authors = set(train_df.iloc[next_match_idx]['author_ids'])
+        next_score = top_scores[i]
+        next_id = index.article_ids[next_match_idx]
+        next_authors = index.authors_of(next_match_idx)
 
-        # Calculate intersection
-        overlap = candidates.intersection(next_authors)
+        # Calculate intersection (both sorted and unique)
+        overlap = np.intersect1d(candidates, next_authors, assume_unique=True)
 
         print(f"\nRank {i+1} | Article {next_id} | Score: {next_score:.4f}")
-        print(f"Article authors: {next_authors}")
+        print(f"Article authors: {set(index.ids[next_authors])}")
 
         if len(overlap) == 0:
             print("No overlap with current candidates. Continuing...")
             continue
 
         elif len(overlap) == 1:
-            winner = list(overlap)[0]
+            winner = index.ids[overlap[0]]
             print(f"[RESULT] Found unique tie-breaker at rank {i+1}")
             print(f"Winner identified: {winner}")
             print("-" * 60)
             return winner, best_article_id, f"Tie broken by rank {i+1}"
 
         else: # len(overlap) > 1
-            print(f"Multiple candidates match ({overlap}). Narrowing candidate pool.")
+            print(f"Multiple candidates match ({set(index.ids[overlap])}). Narrowing candidate pool.")
             candidates = overlap
 
     # 6. STEP 3: Fallback
     print(f"\n[STEP 3] FALLBACK")
-    print(f"Checked all {k_depth} articles. Tie persists between: {candidates}")
-    winner = random.choice(list(candidates))
+    print(f"Checked all {len(top_indices)} articles. Tie persists between: {set(index.ids[candidates])}")
+    winner = index.ids[random.choice(candidates)]
     print(f"Action: Randomly selecting from remaining candidates: {winner}")
     print("-" * 60)
     return str(winner), best_article_id, "Random Fallback (Tie)"
@@ -187,20 +205,8 @@ def recommend_reviewer_logic_verbose(query_text, k_depth=20):
 
 
 def get_author_name(auth_id):
-    if auth_id is None: 
-        return "N/A"
-
-    # Force search ID to string and strip any quotes
-    search_id = str(auth_id).strip().strip("'\"")
-
-    # Search in authors dataframe
-    match = authors[authors['id'] == search_id]
-
-    if not match.empty:
-        return match.iloc[0]['name']
-    else:
-        # Debugging: if not found, let's see what the ID actually looks like
-        return f"Unknown ({search_id})"
+    # O(1) lookup in the index built with the model ("N/A" for None, "Unknown (<id>)" if absent)
+    return index.name(auth_id)
 
 
 # In[79]:
@@ -232,6 +238,33 @@ print(f"Selection Method:    {method}")
 # In[ ]:
 
 
+# Evaluate on the whole test split in one batch
+from recommender import ReviewerRecommender
+
+recommender = ReviewerRecommender(engine, index)
+results = recommender.recommend_many(test_df['text_for_tfidf'], k_depth=20, verbose=True)
+
+hits = [rec in actual for rec, actual in zip(results['rec_id'], test_df['author_ids'])]
+print(f"Recommended reviewer is an author of the test article: {np.mean(hits):.1%}")
+
+
+# In[ ]:
+
+
+# Alternative: rank authors directly against one TF-IDF profile (centroid) per author
+from recommender import AuthorProfileRecommender
+
+profiles = AuthorProfileRecommender(engine, index, authors)
+ranked = profiles.recommend_many(test_df['text_for_tfidf'], top_n=5, verbose=True)
+
+for n in (1, 5):
+    hits = [bool(set(rec_ids[:n]) & set(actual)) for rec_ids, actual in zip(ranked['rec_ids'], test_df['author_ids'])]
+    print(f"An author of the test article in the top {n}: {np.mean(hits):.1%}")
+
+
+# In[ ]:
+
+
 
 
 
@@ -0,0 +1,146 @@
+"""Versioned on-disk model bundle: plain .npy arrays plus a JSON manifest, memory-mapped at load time."""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from recommender import AuthorIndex
+from retrieval import SparseSearchEngine
+
+BUNDLE_FORMAT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+# TfidfVectorizer parameters that shape transform(); callables cannot be bundled
+VECTORIZER_PARAMS = ("input", "encoding", "decode_error", "strip_accents", "lowercase", "analyzer",
+                     "stop_words", "token_pattern", "ngram_range", "max_df", "min_df", "max_features",
+                     "binary", "norm", "use_idf", "smooth_idf", "sublinear_tf")
+
+def corpus_hash(texts) -> str:
+    """sha256 of the training texts, in row order (NaN counts as an empty text)."""
+    digest = hashlib.sha256()
+    for text in pd.Series(texts).fillna(''):
+        digest.update(str(text).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _vectorizer_params(vectorizer: TfidfVectorizer) -> dict:
+    params = vectorizer.get_params()
+    for name in ("analyzer", "tokenizer", "preprocessor"):
+        if callable(params.get(name)):
+            raise ValueError(f"Cannot bundle a vectorizer with a callable {name}")
+    params = {name: params[name] for name in VECTORIZER_PARAMS}
+    if params["stop_words"] is not None and not isinstance(params["stop_words"], str):
+        params["stop_words"] = sorted(params["stop_words"])
+    return params
+
+def save_model(path: str, engine: SparseSearchEngine, index: AuthorIndex, texts) -> dict:
+    """
+    Writes the fitted recommender to the folder `path`:
+      vocabulary.npy        terms, sorted (column j of the matrix is term j)
+      idf.npy               float32 IDF weights
+      postings_*.npy        the engine's terms x articles CSR matrix (data, indices, indptr)
+      article_ids.npy, author_ids.npy, author_names.npy, article_authors_*.npy,
+      author_articles_*.npy the AuthorIndex
+      manifest.json         format version, corpus hash, vectorizer parameters, shapes
+
+    Args:
+        path (str): bundle folder (created if needed, files overwritten).
+        engine (SparseSearchEngine): search over the training articles.
+        index (AuthorIndex): their authors.
+        texts: the training texts the vectorizer was fitted on (for the corpus hash).
+
+    Returns:
+        dict: the manifest.
+    """
+    os.makedirs(path, exist_ok=True)
+    vectorizer = engine.vectorizer
+    terms = vectorizer.get_feature_names_out()
+    # get_feature_names_out is ordered by column; columns are sorted by term after fit
+    if not np.all(terms[:-1] < terms[1:]):
+        raise ValueError("Vocabulary columns are not in sorted term order")
+
+    arrays = {
+        "vocabulary": terms.astype(str),
+        "idf": vectorizer.idf_.astype(np.float32),
+        "article_ids": index.article_ids,
+        "author_ids": index.ids.astype(str),
+        "author_names": np.array(["" if name is None else name for name in index.names], dtype=str),
+    }
+    postings = engine.postings.tocsr()
+    postings.sort_indices()
+    matrices = {"postings": postings, "article_authors": index.article_authors.tocsr(),
+                "author_articles": index.author_articles.tocsr()}
+    for prefix, matrix in matrices.items():
+        # one index dtype for indices and indptr: scipy casts a pair that differs
+        # to a common dtype at load, which copies the memory-mapped array into RAM
+        index_dtype = np.int32 if max(matrix.nnz, *matrix.shape) < 2 ** 31 else np.int64
+        arrays[f"{prefix}_data"] = matrix.data
+        arrays[f"{prefix}_indices"] = matrix.indices.astype(index_dtype)
+        arrays[f"{prefix}_indptr"] = matrix.indptr.astype(index_dtype)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array, allow_pickle=False)
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+        "corpus_hash": corpus_hash(texts),
+        "vectorizer": _vectorizer_params(vectorizer),
+        **{f"{prefix}_shape": list(matrix.shape) for prefix, matrix in matrices.items()},
+        "files": {name: {"dtype": str(array.dtype), "shape": list(array.shape)} for name, array in arrays.items()},
+    }
+    with open(os.path.join(path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+def load_manifest(path: str) -> dict:
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format {manifest.get('format_version')!r} in {path}, "
+                         f"expected {BUNDLE_FORMAT_VERSION}")
+    return manifest
+
+def load_model(path: str, expected_corpus_hash: str = None, mmap_mode: str = "r") -> tuple:
+    """
+    Opens a bundle written by save_model. The matrices are memory-mapped
+    (`mmap_mode`), so loading reads only the manifest and the vocabulary, and
+    processes serving the same bundle share its pages through the OS cache.
+
+    Args:
+        path (str): bundle folder.
+        expected_corpus_hash (str): if given, a bundle fitted on another corpus
+            (see corpus_hash) raises ValueError.
+        mmap_mode (str): np.load mmap_mode of the matrix arrays (None: read into memory).
+
+    Returns:
+        tuple: (engine, index, manifest) - SparseSearchEngine, AuthorIndex and the manifest dict.
+    """
+    manifest = load_manifest(path)
+    if expected_corpus_hash is not None and manifest["corpus_hash"] != expected_corpus_hash:
+        raise ValueError(f"Bundle {path} was fitted on another corpus")
+
+    def array(name, mmap=mmap_mode):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap, allow_pickle=False)
+
+    def csr(prefix):
+        return sp.csr_matrix((array(f"{prefix}_data"), array(f"{prefix}_indices"), array(f"{prefix}_indptr")),
+                             shape=tuple(manifest[f"{prefix}_shape"]), copy=False)
+
+    params = dict(manifest["vectorizer"], ngram_range=tuple(manifest["vectorizer"]["ngram_range"]))
+    vectorizer = TfidfVectorizer(**params)
+    vocabulary = array("vocabulary", None)
+    vectorizer.vocabulary_ = dict(zip(vocabulary.tolist(), range(len(vocabulary))))
+    vectorizer.idf_ = array("idf", None)
+
+    engine = SparseSearchEngine.from_postings(vectorizer, csr("postings"))
+    index = AuthorIndex.from_arrays(array("article_ids", None), array("author_ids", None),
+                                    array("author_names", None), csr("article_authors"), csr("author_articles"))
+    return engine, index, manifest
@@ -0,0 +1,278 @@
+"""Batch reviewer recommendation: nearest-article anchoring with tie-breaking, or ranking of per-author profiles."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from retrieval import SparseSearchEngine
+
+class AuthorIndex:
+    """
+    Integer-coded authorship of the training articles, built once at load time.
+
+    Every author id (those of 00-authors.csv and those of the training rows) gets
+    a code, its position in the sorted `ids` array; `names[code]` is its name.
+    `article_authors` (articles x authors CSR) holds the sorted author codes of each
+    article, `author_articles` (authors x articles CSR) the inverse mapping.
+
+    Usage:
+        index = AuthorIndex(train_df['article_id'], train_df['author_ids'], authors)
+        codes = index.authors_of(row)        # sorted int array
+        index.ids[codes], index.name('AUTH_00112')
+    """
+
+    def __init__(self, article_ids, author_ids, authors: pd.DataFrame = None):
+        """
+        Args:
+            article_ids: article_id of each training row, in the matrix row order.
+            author_ids: list of author ids of each training row, same order.
+            authors (pd.DataFrame): 00-authors.csv (id, name), for the names.
+        """
+        self.article_ids = np.asarray(article_ids)
+        author_ids = [[str(a) for a in ids] for ids in author_ids]
+        known = [] if authors is None else authors['id'].astype(str).str.strip().tolist()
+        # object arrays of str: indexing them gives plain strings, as the id lists held
+        self.ids = np.array(sorted(set(known).union(*author_ids)), dtype=object)
+        self.codes = {author_id: code for code, author_id in enumerate(self.ids)}
+
+        self.names = np.full(len(self.ids), None, dtype=object)
+        if authors is not None:
+            named = authors.dropna(subset=['name'])
+            self.names[[self.codes[str(a).strip()] for a in named['id']]] = named['name'].tolist()
+
+        indptr = np.cumsum([0] + [len(set(ids)) for ids in author_ids])
+        indices = np.concatenate([np.sort([self.codes[a] for a in set(ids)]) for ids in author_ids]
+                                 + [np.empty(0, dtype=np.int64)]).astype(np.int32)
+        self.article_authors = sp.csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr),
+                                             shape=(len(self.article_ids), len(self.ids)))
+        self.author_articles = self.article_authors.T.tocsr()
+        self.author_articles.sort_indices()
+
+    @classmethod
+    def from_arrays(cls, article_ids, ids, names, article_authors: sp.csr_matrix,
+                    author_articles: sp.csr_matrix = None) -> "AuthorIndex":
+        """
+        An index from the arrays of a saved one (see bundle.save_model), without rebuilding
+        them; author_articles is derived from article_authors when not given.
+        """
+        index = cls.__new__(cls)
+        index.article_ids = np.asarray(article_ids)
+        index.ids = np.array([str(author_id) for author_id in ids], dtype=object)
+        index.codes = {author_id: code for code, author_id in enumerate(index.ids)}
+        index.names = np.array([str(name) or None for name in names], dtype=object)
+        index.article_authors = article_authors
+        if author_articles is None:
+            author_articles = article_authors.T.tocsr()
+            author_articles.sort_indices()
+        index.author_articles = author_articles
+        return index
+
+    def authors_of(self, row: int) -> np.ndarray:
+        """Sorted author codes of the training article at matrix row `row`."""
+        return self.article_authors.indices[self.article_authors.indptr[row]:self.article_authors.indptr[row + 1]]
+
+    def articles_of(self, author_id) -> np.ndarray:
+        """Sorted matrix rows of the training articles written by `author_id` (an id or a code)."""
+        code = author_id if isinstance(author_id, (int, np.integer)) else self.codes.get(str(author_id))
+        if code is None:
+            return np.empty(0, dtype=np.int32)
+        return self.author_articles.indices[self.author_articles.indptr[code]:self.author_articles.indptr[code + 1]]
+
+    def name(self, author_id) -> str:
+        """The author's name; "N/A" for None, "Unknown (<id>)" for an id without one."""
+        if author_id is None:
+            return "N/A"
+        search_id = str(author_id).strip().strip("'\"")
+        code = self.codes.get(search_id)
+        if code is None or self.names[code] is None:
+            return f"Unknown ({search_id})"
+        return self.names[code]
+
+class ReviewerRecommender:
+    """
+    recommend_reviewer_logic_verbose for many queries at once.
+
+    Same decision as the notebook function: the authors of the nearest article are
+    the candidates; while several remain, the next articles (by rank) narrow them
+    down, an article sharing exactly one candidate decides, one sharing none is
+    skipped; if a tie survives all k_depth articles a remaining candidate is drawn
+    at random. The ranks are walked once for the whole block of queries, each step
+    being boolean operations on a (queries x authors) candidate matrix.
+
+    The articles are ranked as SparseSearchEngine.search ranks them: equal scores by
+    descending row, the order of the notebook's `argsort()[::-1]` with a stable sort.
+    numpy's default sort is not stable, so where the nearest articles tie (duplicate
+    articles scoring 1.0) the notebook as first written may anchor on another of them.
+
+    Usage:
+        recommender = ReviewerRecommender(engine, index)
+        results = recommender.recommend_many(test_df['text_for_tfidf'], k_depth=20)
+    """
+
+    def __init__(self, engine: SparseSearchEngine, index: AuthorIndex):
+        """
+        Args:
+            engine (SparseSearchEngine): search over the training articles.
+            index (AuthorIndex): their authors, in the engine's row order.
+        """
+        self.engine = engine
+        self.index = index
+
+    def recommend_many(self, texts, k_depth: int = 20, block_cells: int = 2 ** 22,
+                       random_state=None, verbose: bool = False) -> pd.DataFrame:
+        """
+        Args:
+            texts: query texts (text_for_tfidf).
+            k_depth (int): nearest articles scanned for a tie-breaker.
+            block_cells (int): memory cap of the similarity blocks (see SparseSearchEngine.search_many).
+            random_state: seed of the tie fallback draw.
+            verbose (bool): print timings and how each recommendation was decided.
+
+        Returns:
+            pd.DataFrame: one row per text - rec_id, match_article_id, score (similarity of
+                the nearest article) and method, as recommend_reviewer_logic_verbose returns them.
+        """
+        start = time.perf_counter()
+        texts = pd.Series(texts).fillna('').tolist()
+        top_indices, top_scores = self.engine.search_many(texts, k_depth, block_cells)
+        searched = time.perf_counter()
+
+        n, k = top_indices.shape
+        matched = top_indices[:, 0] >= 0
+        winners = np.full(n, -1)
+        methods = np.full(n, "No Matches", dtype=object)
+        undecided = matched.copy()
+
+        # STEP 1: the authors of the nearest article
+        candidates = self._authors_at(top_indices[:, 0])
+        counts = candidates.sum(axis=1)
+        direct = undecided & (counts == 1)
+        winners[direct] = candidates[direct].argmax(axis=1)
+        methods[direct] = "Direct Match"
+        undecided &= ~direct
+
+        # STEP 2: narrow the candidates rank by rank
+        for rank in range(1, k):
+            if not undecided.any():
+                break
+            overlap = candidates & self._authors_at(top_indices[:, rank])
+            counts = overlap.sum(axis=1)
+            broken = undecided & (counts == 1)
+            winners[broken] = overlap[broken].argmax(axis=1)
+            methods[broken] = f"Tie broken by rank {rank + 1}"
+            narrowed = undecided & (counts > 1)
+            candidates[narrowed] = overlap[narrowed]
+            undecided &= ~broken
+
+        # STEP 3: random draw among the candidates left
+        fallback = undecided & candidates.any(axis=1)
+        rng = np.random.default_rng(random_state)
+        draws = rng.random(candidates[fallback].shape) * candidates[fallback]
+        winners[fallback] = draws.argmax(axis=1)
+        methods[fallback] = "Random Fallback (Tie)"
+
+        results = pd.DataFrame({
+            "rec_id": [self.index.ids[w] if w >= 0 else None for w in winners],
+            "match_article_id": np.where(matched, self.index.article_ids[np.maximum(top_indices[:, 0], 0)], None),
+            "score": top_scores[:, 0],
+            "method": methods,
+        })
+        if verbose:
+            print(f"{n} queries: search {searched - start:.2f}s, "
+                  f"disambiguation {time.perf_counter() - searched:.2f}s")
+            print(results["method"].value_counts().to_string())
+        return results
+
+    def _authors_at(self, rows: np.ndarray) -> np.ndarray:
+        """(queries x authors) boolean authors of the articles at `rows`; none for the -1 padding."""
+        authors = self.index.article_authors[np.maximum(rows, 0)].toarray()
+        authors[rows < 0] = False
+        return authors
+
+class AuthorProfileRecommender:
+    """
+    Ranks authors directly against one TF-IDF profile per author.
+
+    An author's profile is the centroid of the (unit) TF-IDF rows of their training
+    articles, renormalized, so a query's score for an author is its cosine with the
+    author's mean direction. Ranking is one sparse product against the
+    (authors x terms) profile matrix (a SparseSearchEngine over the profiles), with
+    no anchor article, no tie-breaking over neighbours and no random fallback:
+    equal scores are ordered by author id.
+
+    Usage:
+        profiles = AuthorProfileRecommender(engine, index, authors)
+        results = profiles.recommend_many(test_df['text_for_tfidf'], top_n=5)
+    """
+
+    def __init__(self, engine: SparseSearchEngine, index: AuthorIndex, authors: pd.DataFrame = None):
+        """
+        Args:
+            engine (SparseSearchEngine): search over the training articles (its
+                vectorizer and normalized matrix are reused).
+            index (AuthorIndex): authors of the training articles, in the engine's row order.
+            authors (pd.DataFrame): 00-authors.csv; its `articles_ids` lists give each
+                author's articles (only training articles are used). Without it the
+                index's author -> articles mapping is used.
+        """
+        self.index = index
+        membership = index.author_articles
+        if authors is not None:
+            membership = self._membership(authors, index)
+        # authors x terms: sum of the author's unit article rows, renormalized to the mean direction
+        profiles = membership.astype(np.float64) @ engine.postings.T.tocsr()
+        self.engine = SparseSearchEngine(engine.vectorizer, normalize(profiles))
+        self.n_profiles = int((membership.getnnz(axis=1) > 0).sum())
+
+    @staticmethod
+    def _membership(authors: pd.DataFrame, index: AuthorIndex) -> sp.csr_matrix:
+        """(authors x training articles) 0/1 matrix from the `articles_ids` column."""
+        row_of = {article_id: row for row, article_id in enumerate(index.article_ids.tolist())}
+        rows, cols = [], []
+        for author_id, article_ids in zip(authors['id'], authors['articles_ids']):
+            code = index.codes[str(author_id).strip()]
+            for article_id in str(article_ids).strip("[]").split(","):
+                row = row_of.get(int(article_id)) if article_id.strip() else None
+                if row is not None:
+                    rows.append(code)
+                    cols.append(row)
+        return sp.csr_matrix((np.ones(len(rows)), (rows, cols)),
+                             shape=(len(index.ids), len(index.article_ids))).sign()
+
+    def rank(self, texts, top_n: int = 5, block_cells: int = 2 ** 22) -> tuple:
+        """
+        Returns:
+            tuple: (codes, scores) - (texts x top_n) author codes and cosines, best first,
+                padded with -1 / 0 when fewer authors share a term with the text.
+        """
+        return self.engine.search_many(pd.Series(texts).fillna('').tolist(), top_n, block_cells)
+
+    def recommend_many(self, texts, top_n: int = 5, block_cells: int = 2 ** 22,
+                       verbose: bool = False) -> pd.DataFrame:
+        """
+        Args:
+            texts: query texts (text_for_tfidf).
+            top_n (int): length of the ranked reviewer list.
+            block_cells (int): memory cap of the score blocks.
+            verbose (bool): print the timing.
+
+        Returns:
+            pd.DataFrame: one row per text - rec_id (best author, None if no author
+                shares a term), score, and the ranked rec_ids / scores lists.
+        """
+        start = time.perf_counter()
+        codes, scores = self.rank(texts, top_n, block_cells)
+        ranked = [[self.index.ids[c] for c in row if c >= 0] for row in codes]
+        results = pd.DataFrame({
+            "rec_id": [ids[0] if ids else None for ids in ranked],
+            "score": scores[:, 0],
+            "rec_ids": ranked,
+            "scores": [row[row > 0].tolist() for row in scores],
+        })
+        if verbose:
+            print(f"{len(results)} queries ranked against {self.n_profiles} author profiles "
+                  f"in {time.perf_counter() - start:.2f}s")
+        return results
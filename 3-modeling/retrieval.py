@@ -0,0 +1,133 @@
+"""Top-k cosine search over the TF-IDF rows of the training articles."""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+class SparseSearchEngine:
+    """
+    Finds the training articles nearest to a query by cosine similarity.
+
+    TfidfVectorizer rows are L2-normalized, so the cosine is a plain sparse dot
+    product. The matrix is stored term-major (an inverted index: one row of
+    postings per term), so a query only reads the postings of its own terms and
+    the cost follows those postings, not the corpus size. Top-k is an
+    argpartition over the articles the query reached.
+
+    Usage:
+        engine = SparseSearchEngine(tfidf, tfidf_matrix)
+        indices, scores = engine.search(query_text, k=20)
+    """
+
+    def __init__(self, vectorizer, matrix):
+        """
+        Args:
+            vectorizer: the fitted TfidfVectorizer (used to transform text queries).
+            matrix: articles x terms TF-IDF matrix from the same vectorizer; rows
+                that are not unit length are normalized, so scores stay cosines.
+        """
+        self.vectorizer = vectorizer
+        matrix = sp.csr_matrix(matrix)
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        if not np.allclose(norms[norms > 0], 1.0):
+            matrix = normalize(matrix)
+        self.n_docs, self.n_terms = matrix.shape
+        # terms x articles: row t lists the articles containing term t, with their weights
+        self.postings = matrix.T.tocsr()
+        self.postings.sort_indices()
+
+    @classmethod
+    def from_postings(cls, vectorizer, postings: sp.csr_matrix) -> "SparseSearchEngine":
+        """
+        An engine over a ready (terms x articles) postings matrix with unit-length
+        article columns, such as the memory-mapped one of bundle.load_model. The
+        matrix is used as is: no normalization, transposition or copy.
+        """
+        engine = cls.__new__(cls)
+        engine.vectorizer = vectorizer
+        engine.postings = postings
+        engine.n_terms, engine.n_docs = postings.shape
+        return engine
+
+    def vectorize(self, queries) -> sp.csr_matrix:
+        """Text (or a list of texts) to L2-normalized query rows; sparse rows are only normalized."""
+        if isinstance(queries, str):
+            queries = [queries]
+        if sp.issparse(queries):
+            return normalize(sp.csr_matrix(queries))
+        return sp.csr_matrix(self.vectorizer.transform(queries))
+
+    def search(self, query, k: int = 20) -> tuple:
+        """
+        The k articles most similar to `query`.
+
+        Args:
+            query: text, or a 1 x terms sparse row from the vectorizer.
+            k (int): number of articles to return.
+
+        Returns:
+            tuple: (indices, scores) - row positions in the training matrix and their
+                cosine similarities, best first; equal scores by descending position, as
+                `scores.argsort(kind="stable")[::-1]` orders them. Articles sharing no term
+                with the query (score 0) are not returned, so there may be fewer than k.
+        """
+        scores = self.vectorize(query) @ self.postings
+        return top_k(scores.indices, scores.data, k)
+
+    def search_many(self, queries, k: int = 20, block_cells: int = 2 ** 22) -> tuple:
+        """
+        search() for many queries: one transform, then one sparse product per block
+        of queries, the block sized so its dense score matrix stays under `block_cells`
+        floats (32 MB by default).
+
+        Args:
+            queries: list of texts, or a queries x terms sparse matrix.
+            k (int): number of articles per query.
+            block_cells (int): cap on block rows x articles.
+
+        Returns:
+            tuple: (indices, scores) - (queries x k) arrays, each row as search() returns
+                it, padded with index -1 and score 0 when fewer than k articles matched.
+        """
+        queries = self.vectorize(list(queries) if not sp.issparse(queries) else queries)
+        k = min(k, self.n_docs)
+        block_rows = max(1, block_cells // self.n_docs)
+        indices = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        scores = np.zeros((queries.shape[0], k))
+        for start in range(0, queries.shape[0], block_rows):
+            block = (queries[start:start + block_rows] @ self.postings).toarray()
+            indices[start:start + len(block)], scores[start:start + len(block)] = top_k_rows(block, k)
+        return indices, scores
+
+def top_k(indices: np.ndarray, scores: np.ndarray, k: int) -> tuple:
+    """(indices, scores) of the k best positive scores, best first, ties by descending index."""
+    positive = scores > 0
+    indices, scores = indices[positive], scores[positive]
+    if len(scores) > k:
+        # everything above the k-th best score, then the last ties at that score by index
+        by_index = np.argsort(indices)[::-1]
+        indices, scores = indices[by_index], scores[by_index]
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above, tied = scores > kth, scores == kth
+        keep = above | (tied & (np.cumsum(tied) <= k - np.count_nonzero(above)))
+        indices, scores = indices[keep], scores[keep]
+    order = np.lexsort((-indices, -scores))
+    return indices[order], scores[order]
+
+def top_k_rows(scores: np.ndarray, k: int) -> tuple:
+    """top_k on every row of a dense (queries x articles) score matrix, padded with -1 / 0."""
+    if scores.shape[1] > k:
+        kth = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+        above = scores > kth
+        tied = scores == kth
+        # the last ties at the k-th score: count them from the highest index down
+        last_tied = np.cumsum(tied[:, ::-1], axis=1)[:, ::-1]
+        keep = above | (tied & (last_tied <= k - above.sum(axis=1, keepdims=True)))
+        indices = np.nonzero(keep)[1].reshape(len(scores), k)
+    else:
+        indices = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    kept = np.take_along_axis(scores, indices, axis=1)
+    order = np.lexsort((-indices, -kept), axis=1)
+    indices, kept = np.take_along_axis(indices, order, axis=1), np.take_along_axis(kept, order, axis=1)
+    empty = kept <= 0
+    return np.where(empty, -1, indices), np.where(empty, 0.0, kept)
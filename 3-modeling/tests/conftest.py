@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules sit next to the notebooks, which import them from 3-modeling/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+"""save_model / load_model round trip."""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from bundle import MANIFEST_NAME, corpus_hash, load_model, save_model
+from recommender import AuthorIndex, ReviewerRecommender
+from retrieval import SparseSearchEngine
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_list(s):
+    if not isinstance(s, str) or not s: return []
+    return [item.strip().strip("'\"") for item in s.strip("[]").split(',')]
+
+def is_mapped(array):
+    """True when the array is a view of a memory-mapped file (scipy wraps it in plain ndarray views)."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+@pytest.fixture(scope="module")
+def model():
+    train_df = pd.read_csv(os.path.join(HERE, '02-train.csv'))
+    test_df = pd.read_csv(os.path.join(HERE, '02-test.csv'))
+    authors = pd.read_csv(os.path.join(HERE, '00-authors.csv'))
+    train_df['author_ids'] = train_df['author_ids'].apply(parse_list)
+    tfidf = TfidfVectorizer(sublinear_tf=True, min_df=2, ngram_range=(1, 1))
+    tfidf_matrix = tfidf.fit_transform(train_df['text_for_tfidf'].fillna(''))
+    engine = SparseSearchEngine(tfidf, tfidf_matrix)
+    index = AuthorIndex(train_df['article_id'], train_df['author_ids'], authors)
+    return train_df, test_df['text_for_tfidf'].fillna('').tolist(), engine, index
+
+def test_round_trip(model, tmp_path):
+    train_df, queries, engine, index = model
+    save_model(str(tmp_path), engine, index, train_df['text_for_tfidf'])
+    loaded, loaded_index, _ = load_model(str(tmp_path), expected_corpus_hash=corpus_hash(train_df['text_for_tfidf']))
+
+    # every matrix array stays memory-mapped
+    for matrix in (loaded.postings, loaded_index.article_authors, loaded_index.author_articles):
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            assert is_mapped(array)
+
+    # the bundle keeps float32 IDF weights
+    expected_rows, actual_rows = engine.vectorize(queries), loaded.vectorize(queries)
+    assert (expected_rows != 0).sum() == (actual_rows != 0).sum()
+    assert abs(expected_rows - actual_rows).max() < 1e-6
+    expected_indices, expected_scores = engine.search_many(queries, k=20)
+    actual_indices, actual_scores = loaded.search_many(queries, k=20)
+    assert np.array_equal(actual_indices, expected_indices)
+    assert np.allclose(actual_scores, expected_scores, rtol=0, atol=1e-6)
+
+    assert loaded_index.ids.tolist() == index.ids.tolist()
+    assert loaded_index.names.tolist() == index.names.tolist()
+    assert loaded_index.article_ids.tolist() == index.article_ids.tolist()
+    assert (loaded_index.article_authors != index.article_authors).nnz == 0
+    assert (loaded_index.author_articles != index.author_articles).nnz == 0
+
+    expected = ReviewerRecommender(engine, index).recommend_many(queries, random_state=0)
+    actual = ReviewerRecommender(loaded, loaded_index).recommend_many(queries, random_state=0)
+    pd.testing.assert_frame_equal(actual, expected)
+
+def test_rejects_other_corpus_and_format(model, tmp_path):
+    train_df, _, engine, index = model
+    save_model(str(tmp_path), engine, index, train_df['text_for_tfidf'])
+    with pytest.raises(ValueError):
+        load_model(str(tmp_path), expected_corpus_hash=corpus_hash(train_df['text_for_tfidf'][1:]))
+
+    manifest_path = tmp_path / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["format_version"] = 0
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_model(str(tmp_path))
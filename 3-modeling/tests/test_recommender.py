@@ -0,0 +1,66 @@
+"""ReviewerRecommender.recommend_many against the notebook's recommend_reviewer_logic_verbose."""
+
+import os
+
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommender import AuthorIndex, ReviewerRecommender
+from retrieval import SparseSearchEngine
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_list(s):
+    if not isinstance(s, str) or not s: return []
+    return [item.strip().strip("'\"") for item in s.strip("[]").split(',')]
+
+def recommend_reviewer_logic(query_text, tfidf, tfidf_matrix, train_df, k_depth=20):
+    """
+    recommend_reviewer_logic_verbose of 01-fitting and inference, without the prints,
+    with a stable argsort, and returning the remaining candidates instead of a random draw.
+    """
+    similarities = cosine_similarity(tfidf.transform([query_text]), tfidf_matrix).flatten()
+    top_indices = similarities.argsort(kind="stable")[::-1][:k_depth]
+    best_match_idx = top_indices[0]
+    if similarities[best_match_idx] == 0:
+        return None, None, "No Matches"
+    best_article_id = train_df.iloc[best_match_idx]['article_id']
+    candidates = set(train_df.iloc[best_match_idx]['author_ids'])
+    if len(candidates) == 1:
+        return candidates, best_article_id, "Direct Match"
+    for i in range(1, len(top_indices)):
+        overlap = candidates.intersection(train_df.iloc[top_indices[i]]['author_ids'])
+        if len(overlap) == 1:
+            return overlap, best_article_id, f"Tie broken by rank {i+1}"
+        if len(overlap) > 1:
+            candidates = overlap
+    return candidates, best_article_id, "Random Fallback (Tie)"
+
+@pytest.fixture(scope="module")
+def model():
+    train_df = pd.read_csv(os.path.join(HERE, '02-train.csv'))
+    test_df = pd.read_csv(os.path.join(HERE, '02-test.csv'))
+    authors = pd.read_csv(os.path.join(HERE, '00-authors.csv'))
+    train_df['author_ids'] = train_df['author_ids'].apply(parse_list)
+    tfidf = TfidfVectorizer(sublinear_tf=True, min_df=2, ngram_range=(1, 1))
+    tfidf_matrix = tfidf.fit_transform(train_df['text_for_tfidf'].fillna(''))
+    index = AuthorIndex(train_df['article_id'], train_df['author_ids'], authors)
+    return tfidf, tfidf_matrix, train_df, test_df, SparseSearchEngine(tfidf, tfidf_matrix), index
+
+def test_recommend_many_matches_verbose_logic(model):
+    tfidf, tfidf_matrix, train_df, test_df, engine, index = model
+    queries = test_df['text_for_tfidf'].fillna('').tolist()
+    results = ReviewerRecommender(engine, index).recommend_many(queries, k_depth=20, random_state=0)
+
+    assert len(results) == len(queries) == 291
+    for query, rec_id, match_article_id, method in zip(
+            queries, results['rec_id'], results['match_article_id'], results['method']):
+        candidates, best_article_id, expected_method = recommend_reviewer_logic(query, tfidf, tfidf_matrix, train_df)
+        assert method == expected_method
+        assert match_article_id == best_article_id
+        if candidates is None:
+            assert rec_id is None
+        else:
+            assert rec_id in candidates
@@ -0,0 +1,49 @@
+"""SparseSearchEngine against the notebook's cosine_similarity + argsort ranking."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from retrieval import SparseSearchEngine, top_k, top_k_rows
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def reference(similarities: np.ndarray, k: int) -> np.ndarray:
+    """The notebook's `similarities.argsort()[::-1][:k]`, with a stable sort so ties are defined."""
+    return similarities.argsort(kind="stable")[::-1][:k]
+
+@pytest.fixture(scope="module")
+def split():
+    train_df = pd.read_csv(os.path.join(HERE, '02-train.csv'))
+    test_df = pd.read_csv(os.path.join(HERE, '02-test.csv'))
+    tfidf = TfidfVectorizer(sublinear_tf=True, min_df=2, ngram_range=(1, 1))
+    tfidf_matrix = tfidf.fit_transform(train_df['text_for_tfidf'].fillna(''))
+    return tfidf, tfidf_matrix, test_df['text_for_tfidf'].fillna('').tolist()
+
+def test_ties_by_descending_index():
+    matrix = sp.csr_matrix(np.array([[1, 0], [0, 1], [1, 0], [1, 1], [1, 0]], dtype=float))
+    engine = SparseSearchEngine(None, matrix)
+    indices, scores = engine.search(sp.csr_matrix([[1.0, 0.0]]), k=3)
+    assert indices.tolist() == [4, 2, 0]
+    assert np.allclose(scores, 1.0)
+    # the k-th place goes to the last of the tied articles
+    assert top_k(np.arange(5), np.array([.5, .9, .5, .5, .2]), 3)[0].tolist() == [1, 3, 2]
+    assert top_k_rows(np.array([[.5, .9, .5, .5, .2]]), 3)[0].tolist() == [[1, 3, 2]]
+
+def test_search_matches_argsort_on_test_split(split):
+    tfidf, tfidf_matrix, queries = split
+    engine = SparseSearchEngine(tfidf, tfidf_matrix)
+    similarities = cosine_similarity(tfidf.transform(queries), tfidf_matrix)
+
+    indices, scores = engine.search_many(queries, k=20)
+    for row, query in enumerate(queries):
+        expected = reference(similarities[row], 20)
+        assert indices[row].tolist() == expected.tolist()
+        assert np.allclose(scores[row], similarities[row][expected])
+        single = engine.search(query, k=20)
+        assert single[0].tolist() == expected.tolist()